@@ -22,6 +22,13 @@ class DatabaseConfig(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # Connection pool sizing, see db.connection.ConnectionPool
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_MAX_IDLE: float = 300.0
+    DB_POOL_HEALTH_CHECK_AFTER: float = 30.0
+
 class UIConfig(BaseModel):
     ui_dir: str = os.path.join(BASE_DIR, "ui")
     styles_path: str = os.path.join(BASE_DIR, "ui", "styles.qss")
@@ -35,6 +42,17 @@ class UIConfig(BaseModel):
     window_width: int = 800
     window_height: int = 600
 
+    # Catalogs up to this size are loaded once and searched in memory
+    # (services.movie_search); larger ones are searched by the database.
+    local_search_max_movies: int = 5000
+
+    # Poster cache (ui.poster_cache): downloaded files are evicted least
+    # recently used first past the disk budget; decoded, display-sized
+    # pixmaps past the memory budget.
+    poster_cache_dir: str = "posters_cache"
+    poster_disk_cache_mb: int = 500
+    poster_memory_cache_mb: int = 64
+
 class AppConfig(BaseModel):
     log_level: int = logging.DEBUG
     app_name: str = "CinemaBooker"
@@ -1,3 +1,4 @@
+from db.booking_repo import BookingRepo
 from db.connection import get_db_connection
 from datetime import date
 
@@ -14,9 +15,9 @@ def force_test_booking():
     cur.execute("""
         SELECT s.id FROM showtimes s
         JOIN movies m ON s.movie_id = m.id
-        WHERE m.title = %s AND s.start_time::date = %s
+        WHERE m.title = %s AND s.start_time >= %s::date AND s.start_time < %s::date + 1
         LIMIT 1
-    """, (target_movie, target_date))
+    """, (target_movie, target_date, target_date))
 
     result = cur.fetchone()
     if not result:
@@ -29,21 +30,21 @@ def force_test_booking():
     cur.execute("SELECT id FROM users LIMIT 1")
     uid = cur.fetchone()[0]
 
-    # 3. Insert specific seats
+    cur.close()
+    conn.close()
+
+    # 3. Book specific seats through the same path the app uses
+    # (for concurrent load, see scripts/load_test_bookings.py)
     test_seats = ['A1', 'A2', 'A3', 'C5', 'H10']
     print(f"🛠️ Booking seats for {target_movie} (ID: {sid})...")
 
-    for seat in test_seats:
-        cur.execute("""
-            INSERT INTO bookings (user_id, showtime_id, seat_id) 
-            VALUES (%s, %s, %s) 
-            ON CONFLICT DO NOTHING
-        """, (uid, sid, seat))
-
-    conn.commit()
-    print(f"✅ Success! Seats {test_seats} are now BOOKED in the database.")
-    cur.close();
-    conn.close()
+    result = BookingRepo().create_booking(uid, sid, test_seats)
+    if result is None:
+        print("❌ Booking failed.")
+    elif result.lost_seats:
+        print(f"⚠️ Seats {result.lost_seats} were already booked, nothing changed.")
+    else:
+        print(f"✅ Success! Seats {test_seats} are now BOOKED in the database.")
 
 
 if __name__ == "__main__":
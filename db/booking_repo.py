@@ -1,31 +1,71 @@
-from db.connection import get_db_connection
+from typing import NamedTuple
+
+from db.connection import db_connection
+
+
+class BookingResult(NamedTuple):
+    booking_id: int | None
+    # Requested seats that another customer booked first
+    lost_seats: list
+
+    @property
+    def ok(self):
+        return self.booking_id is not None
 
 
 class BookingRepo:
-    def create_booking(self, user_id, showtime_id, seat_numbers):
-        conn = get_db_connection()
-        if not conn: return False
+    def create_booking(self, user_id, showtime_id, seat_numbers, total_price=None, start_time=None):
+        """Books the given seats for a showtime, all or nothing.
+
+        The booking header and all of its seats are written by a single
+        statement. Seats are claimed against the unique
+        (showtime_id, showtime_start, seat_number) index with ON CONFLICT DO NOTHING, so
+        concurrent buyers never double-book a seat and nobody waits on a
+        table lock. If any seat was already taken the whole booking is rolled
+        back and the lost seats are reported in the result.
+
+        Bookings live in their showtime's monthly partition; passing the
+        showtime's start_time lets the lookup skip the other months. An
+        unknown showtime loses every seat.
+
+        Returns a BookingResult, or None if the database could not be reached.
+        """
+        seats = list(dict.fromkeys(seat_numbers))
         try:
-            cur = conn.cursor()
-            # 1. Insert into bookings table
-            cur.execute(
-                "INSERT INTO bookings (user_id, showtime_id) VALUES (%s, %s) RETURNING id",
-                (user_id, showtime_id)
-            )
-            booking_id = cur.fetchone()[0]
-
-            # 2. Insert each seat into booked_seats
-            for seat in seat_numbers:
+            # Uncommitted work is rolled back when the connection returns to the pool
+            with db_connection() as conn:
+                cur = conn.cursor()
                 cur.execute(
-                    "INSERT INTO booked_seats (booking_id, seat_number) VALUES (%s, %s)",
-                    (booking_id, seat)
+                    """
+                    WITH showtime AS (
+                        SELECT id, start_time FROM showtimes
+                        WHERE id = %s AND (%s::timestamp IS NULL OR start_time = %s)
+                    ), new_booking AS (
+                        INSERT INTO bookings (user_id, showtime_id, showtime_start, total_price)
+                        SELECT %s, id, start_time, %s FROM showtime
+                        RETURNING id, showtime_id, showtime_start
+                    ), claimed AS (
+                        INSERT INTO booked_seats (booking_id, showtime_id, showtime_start, seat_number)
+                        SELECT nb.id, nb.showtime_id, nb.showtime_start, seat
+                        FROM new_booking nb, unnest(%s::varchar[]) AS seat
+                        ON CONFLICT (showtime_id, showtime_start, seat_number) DO NOTHING
+                        RETURNING seat_number
+                    )
+                    SELECT (SELECT id FROM new_booking),
+                           ARRAY(SELECT seat_number FROM claimed)
+                """,
+                    (showtime_id, start_time, start_time, user_id, total_price, seats),
                 )
+                booking_id, claimed = cur.fetchone()
+
+                claimed = set(claimed)
+                lost_seats = [seat for seat in seats if seat not in claimed]
+                if lost_seats:
+                    conn.rollback()
+                    return BookingResult(None, lost_seats)
 
-            conn.commit()
-            return True
+                conn.commit()
+                return BookingResult(booking_id, [])
         except Exception as e:
             print(f"Booking error: {e}")
-            conn.rollback()
-            return False
-        finally:
-            conn.close()
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -0,0 +1,52 @@
+import csv
+import io
+
+
+class CopyStream:
+    """Read-only file object that feeds rows to cursor.copy_expert() as CSV.
+
+    Rows are pulled from the iterator only as COPY asks for more data, so
+    memory stays bounded by one read chunk no matter how big the source is.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line, lineterminator="\n")
+        self._pending = ""
+        self._done = False
+        self.count = 0
+
+    def read(self, size=-1):
+        while not self._done and (size < 0 or len(self._pending) < size):
+            row = next(self._rows, None)
+            if row is None:
+                self._done = True
+                break
+            self._line.seek(0)
+            self._line.truncate()
+            self._writer.writerow(row)
+            self._pending += self._line.getvalue()
+            self.count += 1
+
+        if size < 0 or size >= len(self._pending):
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def copy_rows(cursor, table, columns, rows):
+    """Streams an iterable of row tuples into `table` with COPY FROM STDIN.
+
+    Returns the number of rows sent.
+    """
+    stream = CopyStream(rows)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        stream,
+    )
+    return stream.count
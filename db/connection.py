@@ -1,38 +1,346 @@
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2 import extensions
 from config import settings
 
 
-def get_db_connection():
-    """Establishes a connection to the PostgreSQL database using config settings."""
-    try:
-        conn = psycopg2.connect(
-            host=settings.db.DB_HOST,
-            port=settings.db.DB_PORT,
-            user=settings.db.DB_USER,
-            password=settings.db.DB_PASSWORD,
-            dbname=settings.db.DB_NAME
-        )
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free within the wait timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections.
+
+    Connections are checked out with getconn() (or the connection() context
+    manager) and handed back with putconn(). Idle connections above min_size
+    are closed once they have been unused for max_idle seconds, and a
+    connection that sat idle for longer than health_check_after seconds is
+    pinged before it is handed out again.
+    """
+
+    def __init__(
+        self,
+        min_size=1,
+        max_size=10,
+        timeout=10.0,
+        max_idle=300.0,
+        health_check_after=30.0,
+        **connect_kwargs,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        self._idle = []  # [(conn, returned_at)], most recently returned last
+        self._in_use = set()
+        self._opening = 0
+        self._closed = False
+
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "health_check_failures": 0,
+        }
+
+        for _ in range(min_size):
+            conn = self._connect()
+            self._idle.append((conn, time.monotonic()))
+
+        self._reaper_stop = threading.Event()
+        self._reaper = None
+        if max_idle and max_idle > 0:
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="db-pool-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connect_kwargs)
+        with self._cond:
+            self._stats["connections_opened"] += 1
         return conn
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
-        return None
 
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats["connections_closed"] += 1
+
+    def _is_healthy(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout=None):
+        """Checks out a connection, waiting up to `timeout` seconds for one."""
+        timeout = self.timeout if timeout is None else timeout
+
+        while True:
+            conn, idle_for = self._acquire(timeout)
+            if conn is None:
+                # A slot was reserved for us, open a new connection outside the lock
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._opening -= 1
+                    self._in_use.add(conn)
+                return conn
+
+            if self._is_healthy(conn, idle_for):
+                return conn
+
+            with self._cond:
+                self._in_use.discard(conn)
+                self._stats["health_check_failures"] += 1
+                self._cond.notify()
+            self._discard(conn)
+
+    def _acquire(self, timeout):
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    result = (conn, time.monotonic() - returned_at)
+                    self._in_use.add(conn)
+                    break
+
+                if len(self._in_use) + self._opening < self.max_size:
+                    self._opening += 1
+                    result = (None, 0.0)
+                    break
+
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._stats["checkouts"] += 1
+            if waited:
+                wait_time = time.monotonic() - started
+                self._stats["waits"] += 1
+                self._stats["wait_time_total"] += wait_time
+                self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+        return result
+
+    def putconn(self, conn):
+        """Returns a connection to the pool, rolling back any open transaction."""
+        reusable = not conn.closed
+        if reusable:
+            try:
+                status = conn.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    reusable = False
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                # The next borrower gets the default session back
+                if conn.autocommit or conn.readonly is not None or conn.isolation_level is not None:
+                    conn.reset()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            self._in_use.discard(conn)
+            if reusable and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._discard(conn)
 
-def verify_database_schema():
-    """Ensures the database has all required columns before the app starts."""
-    conn = get_db_connection()
-    if not conn:
-        return
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
 
+    def reap_idle(self):
+        """Closes connections above min_size that have been idle for max_idle seconds."""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            keep = []
+            # Oldest connections sit at the front of the idle list
+            surplus = len(self._idle) + len(self._in_use) - self.min_size
+            for conn, returned_at in self._idle:
+                if surplus > 0 and now - returned_at >= self.max_idle:
+                    expired.append(conn)
+                    surplus -= 1
+                else:
+                    keep.append((conn, returned_at))
+            self._idle = keep
+
+        for conn in expired:
+            self._discard(conn)
+        return len(expired)
+
+    def _reap_loop(self):
+        interval = max(1.0, self.max_idle / 2)
+        while not self._reaper_stop.wait(interval):
+            self.reap_idle()
+
+    def stats(self):
+        """Returns a snapshot of pool usage and wait metrics."""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = len(self._in_use)
+            snapshot["size"] = len(self._idle) + len(self._in_use)
+        waits = snapshot["waits"]
+        snapshot["wait_time_avg"] = snapshot["wait_time_total"] / waits if waits else 0.0
+        return snapshot
+
+    def reset_wait_max(self):
+        """Restarts wait_time_max, e.g. at the start of a measured run; the counters keep running."""
+        with self._cond:
+            self._stats["wait_time_max"] = 0.0
+
+    def close(self):
+        self._reaper_stop.set()
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+
+class PooledConnection:
+    """Wraps a pooled connection so that close() hands it back to the pool.
+
+    Every other attribute, read or assigned (autocommit, isolation_level,
+    readonly, ...), is the psycopg2 connection's. As a context manager it
+    commits, or rolls back on an exception, and then returns the connection.
+    """
+
+    _OWN_ATTRIBUTES = ("_pool", "_conn")
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._conn is not None and not self._conn.closed:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.putconn(self._conn)
+            self._conn = None
+
+    @property
+    def closed(self):
+        return self._conn is None or self._conn.closed
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name in self._OWN_ATTRIBUTES:
+            object.__setattr__(self, name, value)
+        elif self._conn is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        else:
+            setattr(self._conn, name, value)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=settings.db.DB_POOL_MIN_SIZE,
+                    max_size=settings.db.DB_POOL_MAX_SIZE,
+                    timeout=settings.db.DB_POOL_TIMEOUT,
+                    max_idle=settings.db.DB_POOL_MAX_IDLE,
+                    health_check_after=settings.db.DB_POOL_HEALTH_CHECK_AFTER,
+                    host=settings.db.DB_HOST,
+                    port=settings.db.DB_PORT,
+                    user=settings.db.DB_USER,
+                    password=settings.db.DB_PASSWORD,
+                    dbname=settings.db.DB_NAME,
+                )
+    return _pool
+
+
+@contextmanager
+def db_connection(timeout=None):
+    """Checks a connection out of the pool for the duration of a with-block."""
+    with get_pool().connection(timeout) as conn:
+        yield conn
+
+
+def get_db_connection():
+    """Checks out a pooled connection to the PostgreSQL database.
+
+    Calling close() on the returned connection returns it to the pool instead
+    of tearing down the session.
+    """
     try:
-        cursor = conn.cursor()
-        # This adds the duration column only if it doesn't already exist
-        print("🔍 Checking database schema...")
-        cursor.execute("ALTER TABLE movies ADD COLUMN IF NOT EXISTS duration INTEGER;")
-        conn.commit()
-        print("✅ Schema is up to date.")
+        pool = get_pool()
+        return PooledConnection(pool, pool.getconn())
     except Exception as e:
-        print(f"⚠️ Schema update skipped or failed: {e}")
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
+        print(f"Error connecting to database: {e}")
+        return None
+
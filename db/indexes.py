@@ -0,0 +1,27 @@
+# Secondary indexes backing the hot lookups in ShowtimeRepo, MovieRepo and
+# BookingRepo. Each entry is idempotent so create_indexes() can run on every
+# init; tests/test_query_plans.py verifies the queries actually use them.
+# Migrations spell out the indexes they create instead of reading this dict,
+# so editing it never changes a migration that has already run.
+INDEXES = {
+    # Show dates / showtimes of one movie, filtered by a start_time range
+    "showtimes_movie_start_idx": """
+        CREATE INDEX IF NOT EXISTS showtimes_movie_start_idx
+        ON showtimes (movie_id, start_time)
+    """,
+    # Bookings of a showtime (FK cascades, sales reports)
+    "bookings_showtime_idx": """
+        CREATE INDEX IF NOT EXISTS bookings_showtime_idx
+        ON bookings (showtime_id)
+    """,
+    # Ticket history of a user
+    "bookings_user_idx": """
+        CREATE INDEX IF NOT EXISTS bookings_user_idx
+        ON bookings (user_id)
+    """,
+}
+
+
+def create_indexes(cur):
+    for ddl in INDEXES.values():
+        cur.execute(ddl)
@@ -0,0 +1,623 @@
+import sys
+import os
+import argparse
+from loguru import logger
+
+# Add project root to sys.path to import config/db
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection import get_db_connection
+from db.partitions import ensure_future_partitions
+
+# Serializes migration runs started from several machines at once
+MIGRATION_LOCK_ID = 741_852_001
+# First version with the monthly partitions (and ensure_month_partitions())
+PARTITIONED_VERSION = 8
+
+
+def _sample(items, limit=20):
+    items = list(items)
+    more = f" and {len(items) - limit} more" if len(items) > limit else ""
+    return ", ".join(items[:limit]) + more
+
+
+def _remove_conflicting_seats(cur):
+    """Migration 3: drops the booked seats the per-showtime seat key would reject.
+
+    Seats whose booking is gone (or has no showtime) cannot be placed, and a
+    seat sold more than once for a showtime stays with its earliest booking.
+    Everything removed is logged so the affected bookings can be followed up.
+    """
+    cur.execute("DELETE FROM booked_seats WHERE showtime_id IS NULL RETURNING booking_id, seat_number")
+    orphans = cur.fetchall()
+    if orphans:
+        logger.warning(f"Removed {len(orphans)} booked seat(s) without a booked showtime: "
+                       + _sample(f"booking {b} seat {s}" for b, s in orphans))
+    cur.execute(
+        """
+        DELETE FROM booked_seats bs
+        USING booked_seats kept
+        WHERE kept.showtime_id = bs.showtime_id
+          AND kept.seat_number = bs.seat_number
+          AND kept.booking_id < bs.booking_id
+        RETURNING bs.showtime_id, bs.seat_number, bs.booking_id
+        """
+    )
+    duplicates = cur.fetchall()
+    if duplicates:
+        logger.warning(f"Removed {len(duplicates)} double-booked seat(s), kept with the earliest booking: "
+                       + _sample(f"showtime {st} seat {s} of booking {b}" for st, s, b in duplicates))
+
+
+# (version, description, statements). Versions are applied in order, each in
+# its own transaction, and recorded in schema_version. A statement is SQL, or
+# a function taking the cursor for data fixes that report what they changed.
+# Never edit a migration that has shipped; append a new one instead.
+MIGRATIONS = [
+    (1, "Base tables", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            first_name VARCHAR(50),
+            last_name VARCHAR(50),
+            role VARCHAR(20) DEFAULT 'user',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS movies (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(100) NOT NULL,
+            description TEXT,
+            duration INTEGER,
+            genre VARCHAR(50),
+            release_date DATE,
+            poster_link TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS halls (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(50) NOT NULL,
+            total_seats INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS showtimes (
+            id SERIAL PRIMARY KEY,
+            movie_id INTEGER REFERENCES movies(id) ON DELETE CASCADE,
+            hall_id INTEGER REFERENCES halls(id) ON DELETE CASCADE,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            price DECIMAL(10, 2) NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            showtime_id INTEGER REFERENCES showtimes(id) ON DELETE CASCADE,
+            booking_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            total_price DECIMAL(10, 2)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS booked_seats (
+            booking_id INTEGER REFERENCES bookings(id) ON DELETE CASCADE,
+            seat_number VARCHAR(10) NOT NULL,
+            PRIMARY KEY (booking_id, seat_number)
+        )
+        """,
+    ]),
+    # init_db, reset_db and the old startup ALTER disagreed on column names;
+    # bring every existing database onto movies.duration and showtimes.hall_id.
+    (2, "Reconcile legacy movie and showtime columns", [
+        "ALTER TABLE movies ADD COLUMN IF NOT EXISTS duration INTEGER",
+        "ALTER TABLE movies ADD COLUMN IF NOT EXISTS poster_link TEXT",
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema()
+                         AND table_name = 'movies' AND column_name = 'duration_minutes') THEN
+                UPDATE movies SET duration = duration_minutes WHERE duration IS NULL;
+                ALTER TABLE movies DROP COLUMN duration_minutes;
+            END IF;
+        END
+        $$
+        """,
+        "ALTER TABLE showtimes ADD COLUMN IF NOT EXISTS hall_id INTEGER",
+        "ALTER TABLE showtimes ADD COLUMN IF NOT EXISTS end_time TIMESTAMP",
+        "ALTER TABLE showtimes ADD COLUMN IF NOT EXISTS price DECIMAL(10, 2) NOT NULL DEFAULT 15.00",
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema()
+                         AND table_name = 'showtimes' AND column_name = 'room_id') THEN
+                UPDATE showtimes SET hall_id = room_id WHERE hall_id IS NULL;
+                ALTER TABLE showtimes DROP COLUMN room_id;
+            END IF;
+        END
+        $$
+        """,
+        # room_id was never backed by halls rows
+        """
+        INSERT INTO halls (id, name, total_seats)
+        SELECT DISTINCT s.hall_id, 'Hall ' || s.hall_id, 80
+        FROM showtimes s
+        WHERE s.hall_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM halls h WHERE h.id = s.hall_id)
+        """,
+        "SELECT setval(pg_get_serial_sequence('halls', 'id'), COALESCE((SELECT max(id) FROM halls), 1))",
+        """
+        UPDATE showtimes s SET end_time = s.start_time + make_interval(mins => m.duration)
+        FROM movies m
+        WHERE s.movie_id = m.id AND s.end_time IS NULL AND m.duration IS NOT NULL
+        """,
+        "ALTER TABLE showtimes DROP CONSTRAINT IF EXISTS showtimes_hall_id_fkey",
+        """
+        ALTER TABLE showtimes ADD CONSTRAINT showtimes_hall_id_fkey
+        FOREIGN KEY (hall_id) REFERENCES halls(id) ON DELETE CASCADE
+        """,
+    ]),
+    # A seat can only be sold once per showtime, see BookingRepo.create_booking
+    (3, "Per-showtime unique seats", [
+        """
+        ALTER TABLE booked_seats
+        ADD COLUMN IF NOT EXISTS showtime_id INTEGER REFERENCES showtimes(id) ON DELETE CASCADE
+        """,
+        """
+        UPDATE booked_seats bs SET showtime_id = b.showtime_id
+        FROM bookings b
+        WHERE bs.booking_id = b.id AND bs.showtime_id IS NULL
+        """,
+        _remove_conflicting_seats,
+        "ALTER TABLE booked_seats ALTER COLUMN showtime_id SET NOT NULL",
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS booked_seats_showtime_seat_key
+        ON booked_seats (showtime_id, seat_number)
+        """,
+    ]),
+    # Seat occupancy bitmap per showtime, kept in sync by triggers (see db/seat_map.py)
+    (4, "Seat occupancy bitmap", [
+        """
+        ALTER TABLE showtimes
+        ADD COLUMN IF NOT EXISTS seat_map BIT(80) NOT NULL DEFAULT B'0'::bit(80)
+        """,
+        """
+        CREATE OR REPLACE FUNCTION seat_index(seat VARCHAR) RETURNS INTEGER
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT (ascii(upper(left(seat, 1))) - 65) * 10 + substring(seat FROM 2)::int - 1
+        $$
+        """,
+        """
+        CREATE OR REPLACE FUNCTION seat_map_add_seats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE showtimes s SET seat_map = s.seat_map | m.mask
+            FROM (
+                SELECT showtime_id, bit_or(B'1'::bit(80) >> seat_index(seat_number)) AS mask
+                FROM new_seats GROUP BY showtime_id
+            ) m
+            WHERE s.id = m.showtime_id;
+            RETURN NULL;
+        END
+        $$
+        """,
+        """
+        CREATE OR REPLACE FUNCTION seat_map_remove_seats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE showtimes s SET seat_map = s.seat_map & ~m.mask
+            FROM (
+                SELECT showtime_id, bit_or(B'1'::bit(80) >> seat_index(seat_number)) AS mask
+                FROM old_seats GROUP BY showtime_id
+            ) m
+            WHERE s.id = m.showtime_id;
+            RETURN NULL;
+        END
+        $$
+        """,
+        # Statement-level, so a multi-seat booking updates its showtime row once
+        "DROP TRIGGER IF EXISTS booked_seats_map_insert ON booked_seats",
+        """
+        CREATE TRIGGER booked_seats_map_insert
+        AFTER INSERT ON booked_seats
+        REFERENCING NEW TABLE AS new_seats
+        FOR EACH STATEMENT EXECUTE FUNCTION seat_map_add_seats()
+        """,
+        "DROP TRIGGER IF EXISTS booked_seats_map_delete ON booked_seats",
+        """
+        CREATE TRIGGER booked_seats_map_delete
+        AFTER DELETE ON booked_seats
+        REFERENCING OLD TABLE AS old_seats
+        FOR EACH STATEMENT EXECUTE FUNCTION seat_map_remove_seats()
+        """,
+        """
+        UPDATE showtimes s SET seat_map = m.mask
+        FROM (
+            SELECT showtime_id, bit_or(B'1'::bit(80) >> seat_index(seat_number)) AS mask
+            FROM booked_seats GROUP BY showtime_id
+        ) m
+        WHERE s.id = m.showtime_id AND s.seat_map <> m.mask
+        """,
+    ]),
+    (5, "Indexes for hot schedule and booking queries", [
+        """
+        CREATE INDEX IF NOT EXISTS showtimes_movie_start_idx
+        ON showtimes (movie_id, start_time)
+        """,
+        "CREATE INDEX IF NOT EXISTS bookings_showtime_idx ON bookings (showtime_id)",
+        "CREATE INDEX IF NOT EXISTS bookings_user_idx ON bookings (user_id)",
+    ]),
+    # Typed IMDb fields loaded by scripts/import_movies.py
+    (6, "IMDb catalog fields", [
+        """
+        ALTER TABLE movies
+            ADD COLUMN IF NOT EXISTS released_year SMALLINT,
+            ADD COLUMN IF NOT EXISTS certificate VARCHAR(10),
+            ADD COLUMN IF NOT EXISTS imdb_rating NUMERIC(3, 1),
+            ADD COLUMN IF NOT EXISTS meta_score SMALLINT,
+            ADD COLUMN IF NOT EXISTS director VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS stars TEXT,
+            ADD COLUMN IF NOT EXISTS votes INTEGER,
+            ADD COLUMN IF NOT EXISTS gross BIGINT
+        """,
+    ]),
+    # Incremental catalog sync: movies are matched on (title, released_year),
+    # changed rows are detected by content_hash and dropped titles are retired
+    # instead of deleted so their showtimes, bookings and posters survive.
+    # Movies loaded before migration 6 have no year (and the feed repeats some
+    # titles, e.g. "Drishyam"), so the key only covers rows that have one; the
+    # first sync fills the year in, see scripts/import_movies.py.
+    (7, "Catalog sync keys", [
+        """
+        ALTER TABLE movies
+            ADD COLUMN IF NOT EXISTS content_hash CHAR(32),
+            ADD COLUMN IF NOT EXISTS retired_at TIMESTAMP
+        """,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS movies_natural_key
+        ON movies (title, released_year) WHERE released_year IS NOT NULL
+        """,
+    ]),
+    # Showtimes, bookings and booked seats are range-partitioned by the month
+    # the show starts in (see db/partitions.py), so showtime lookups prune to
+    # one month and old months are detached instead of deleted. Bookings and
+    # seats carry their show's start as showtime_start: the seat claim must be
+    # unique within one partition and the foreign keys need the partition key.
+    # The tables are rebuilt: existing rows are copied into the new parents.
+    (8, "Monthly partitions for showtimes and bookings", [
+        # ensure_month_partitions(first_month, last_month), see db/partitions.py
+        """
+        CREATE OR REPLACE FUNCTION ensure_month_partitions(first_month DATE, last_month DATE)
+        RETURNS INTEGER LANGUAGE plpgsql AS $$
+        DECLARE
+            part_month DATE := date_trunc('month', first_month)::date;
+            parent TEXT;
+            child TEXT;
+            created INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_month_partitions'));
+            WHILE part_month <= last_month LOOP
+                FOREACH parent IN ARRAY ARRAY['showtimes', 'bookings', 'booked_seats'] LOOP
+                    child := parent || '_' || to_char(part_month, 'YYYY_MM');
+                    IF to_regclass(child) IS NULL THEN
+                        EXECUTE format(
+                            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                            child, parent, part_month, (part_month + interval '1 month')::date
+                        );
+                        created := created + 1;
+                    END IF;
+                END LOOP;
+                part_month := (part_month + interval '1 month')::date;
+            END LOOP;
+            RETURN created;
+        END
+        $$
+        """,
+        "DROP TRIGGER IF EXISTS booked_seats_map_insert ON booked_seats",
+        "DROP TRIGGER IF EXISTS booked_seats_map_delete ON booked_seats",
+        "ALTER TABLE booked_seats RENAME TO booked_seats_legacy",
+        "ALTER TABLE bookings RENAME TO bookings_legacy",
+        "ALTER TABLE showtimes RENAME TO showtimes_legacy",
+        """
+        CREATE TABLE showtimes (
+            id INTEGER NOT NULL DEFAULT nextval('showtimes_id_seq'),
+            movie_id INTEGER,
+            hall_id INTEGER,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            price DECIMAL(10, 2) NOT NULL,
+            seat_map BIT(80) NOT NULL DEFAULT B'0'::bit(80)
+        ) PARTITION BY RANGE (start_time)
+        """,
+        """
+        CREATE TABLE bookings (
+            id INTEGER NOT NULL DEFAULT nextval('bookings_id_seq'),
+            user_id INTEGER,
+            showtime_id INTEGER NOT NULL,
+            showtime_start TIMESTAMP NOT NULL,
+            booking_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            total_price DECIMAL(10, 2)
+        ) PARTITION BY RANGE (showtime_start)
+        """,
+        """
+        CREATE TABLE booked_seats (
+            booking_id INTEGER NOT NULL,
+            showtime_id INTEGER NOT NULL,
+            showtime_start TIMESTAMP NOT NULL,
+            seat_number VARCHAR(10) NOT NULL
+        ) PARTITION BY RANGE (showtime_start)
+        """,
+        """
+        SELECT ensure_month_partitions(
+            LEAST(COALESCE(min(start_time), localtimestamp), localtimestamp)::date,
+            (GREATEST(COALESCE(max(start_time), localtimestamp), localtimestamp)
+             + interval '12 months')::date
+        )
+        FROM showtimes_legacy
+        """,
+        """
+        INSERT INTO showtimes (id, movie_id, hall_id, start_time, end_time, price, seat_map)
+        SELECT id, movie_id, hall_id, start_time, end_time, price, seat_map FROM showtimes_legacy
+        """,
+        # A booking without a showtime has no month to live in and is dropped
+        """
+        INSERT INTO bookings (id, user_id, showtime_id, showtime_start, booking_date, total_price)
+        SELECT b.id, b.user_id, b.showtime_id, s.start_time, b.booking_date, b.total_price
+        FROM bookings_legacy b
+        JOIN showtimes_legacy s ON s.id = b.showtime_id
+        """,
+        """
+        INSERT INTO booked_seats (booking_id, showtime_id, showtime_start, seat_number)
+        SELECT bs.booking_id, b.showtime_id, b.showtime_start, bs.seat_number
+        FROM booked_seats_legacy bs
+        JOIN bookings b ON b.id = bs.booking_id
+        """,
+        "ALTER SEQUENCE showtimes_id_seq OWNED BY showtimes.id",
+        "ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id",
+        "DROP TABLE booked_seats_legacy",
+        "DROP TABLE bookings_legacy",
+        "DROP TABLE showtimes_legacy",
+        # Ids come from the sequences; the keys only include the partition
+        # column because PostgreSQL requires it for unique constraints.
+        "ALTER TABLE showtimes ADD PRIMARY KEY (id, start_time)",
+        """
+        ALTER TABLE showtimes ADD CONSTRAINT showtimes_movie_id_fkey
+        FOREIGN KEY (movie_id) REFERENCES movies(id) ON DELETE CASCADE
+        """,
+        """
+        ALTER TABLE showtimes ADD CONSTRAINT showtimes_hall_id_fkey
+        FOREIGN KEY (hall_id) REFERENCES halls(id) ON DELETE CASCADE
+        """,
+        "ALTER TABLE bookings ADD PRIMARY KEY (id, showtime_start)",
+        """
+        ALTER TABLE bookings ADD CONSTRAINT bookings_user_id_fkey
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        """,
+        # ON UPDATE CASCADE: rescheduling a show moves its bookings and seats along
+        """
+        ALTER TABLE bookings ADD CONSTRAINT bookings_showtime_fkey
+        FOREIGN KEY (showtime_id, showtime_start) REFERENCES showtimes (id, start_time)
+        ON DELETE CASCADE ON UPDATE CASCADE
+        """,
+        "ALTER TABLE booked_seats ADD PRIMARY KEY (booking_id, showtime_start, seat_number)",
+        """
+        ALTER TABLE booked_seats ADD CONSTRAINT booked_seats_booking_fkey
+        FOREIGN KEY (booking_id, showtime_start) REFERENCES bookings (id, showtime_start)
+        ON DELETE CASCADE ON UPDATE CASCADE
+        """,
+        # showtime_start follows from showtime_id, so this is still one seat per showtime
+        """
+        CREATE UNIQUE INDEX booked_seats_showtime_seat_key
+        ON booked_seats (showtime_id, showtime_start, seat_number)
+        """,
+        # The rebuilt tables need the secondary indexes of migration 5 again
+        """
+        CREATE INDEX IF NOT EXISTS showtimes_movie_start_idx
+        ON showtimes (movie_id, start_time)
+        """,
+        "CREATE INDEX IF NOT EXISTS bookings_showtime_idx ON bookings (showtime_id)",
+        "CREATE INDEX IF NOT EXISTS bookings_user_idx ON bookings (user_id)",
+        """
+        CREATE OR REPLACE FUNCTION seat_map_add_seats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE showtimes s SET seat_map = s.seat_map | m.mask
+            FROM (
+                SELECT showtime_id, showtime_start,
+                       bit_or(B'1'::bit(80) >> seat_index(seat_number)) AS mask
+                FROM new_seats GROUP BY showtime_id, showtime_start
+            ) m
+            WHERE s.id = m.showtime_id AND s.start_time = m.showtime_start;
+            RETURN NULL;
+        END
+        $$
+        """,
+        """
+        CREATE OR REPLACE FUNCTION seat_map_remove_seats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE showtimes s SET seat_map = s.seat_map & ~m.mask
+            FROM (
+                SELECT showtime_id, showtime_start,
+                       bit_or(B'1'::bit(80) >> seat_index(seat_number)) AS mask
+                FROM old_seats GROUP BY showtime_id, showtime_start
+            ) m
+            WHERE s.id = m.showtime_id AND s.start_time = m.showtime_start;
+            RETURN NULL;
+        END
+        $$
+        """,
+        """
+        CREATE TRIGGER booked_seats_map_insert
+        AFTER INSERT ON booked_seats
+        REFERENCING NEW TABLE AS new_seats
+        FOR EACH STATEMENT EXECUTE FUNCTION seat_map_add_seats()
+        """,
+        """
+        CREATE TRIGGER booked_seats_map_delete
+        AFTER DELETE ON booked_seats
+        REFERENCING OLD TABLE AS old_seats
+        FOR EACH STATEMENT EXECUTE FUNCTION seat_map_remove_seats()
+        """,
+    ]),
+    # Catalog search, see MovieRepo.search_ids(): weighted full-text over title,
+    # genre and description plus trigrams on the title for typos.
+    (9, "Movie search indexes", [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        """
+        ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(genre, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS movies_search_idx ON movies USING gin (search_vector)",
+        "CREATE INDEX IF NOT EXISTS movies_title_trgm_idx ON movies USING gin (title gin_trgm_ops)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def ensure_version_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def get_schema_version(cur):
+    """Returns the highest applied migration, or None if migrations never ran."""
+    cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute("SELECT COALESCE(max(version), 0) FROM schema_version")
+    return cur.fetchone()[0]
+
+
+def migrate(conn, target=None):
+    """Applies every pending migration up to `target` and returns the versions applied.
+
+    Once the schema is partitioned, also creates the partitions for the
+    coming months, so every deployment extends the window.
+    """
+    target = LATEST_VERSION if target is None else target
+    applied = []
+    cur = conn.cursor()
+    try:
+        for version, description, statements in MIGRATIONS:
+            if version > target:
+                break
+
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+            ensure_version_table(cur)
+            # Re-read under the lock: another runner may have just applied it
+            cur.execute("SELECT 1 FROM schema_version WHERE version = %s", (version,))
+            if cur.fetchone():
+                conn.commit()
+                continue
+
+            logger.info(f"Applying migration {version}: {description}")
+            for statement in statements:
+                if callable(statement):
+                    statement(cur)
+                else:
+                    cur.execute(statement)
+            cur.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description),
+            )
+            conn.commit()
+            applied.append(version)
+
+        if target >= PARTITIONED_VERSION:
+            ensure_future_partitions(cur)
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return applied
+
+
+def verify_database_schema():
+    """Read-only startup check that the database is on the expected schema version.
+
+    Migrations are never applied from here: run `python -m db.migrations`
+    once per deployment instead.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return False
+
+    try:
+        cursor = conn.cursor()
+        version = get_schema_version(cursor)
+        cursor.close()
+        if version is None:
+            print("⚠️ Database has no schema_version table. Run: python -m db.migrations")
+            return False
+        if version < LATEST_VERSION:
+            print(f"⚠️ Database schema is at version {version}, expected {LATEST_VERSION}. "
+                  "Run: python -m db.migrations")
+            return False
+        if version > LATEST_VERSION:
+            print(f"⚠️ Database schema version {version} is newer than this client ({LATEST_VERSION}).")
+            return False
+        print(f"✅ Schema is up to date (version {version}).")
+        return True
+    except Exception as e:
+        print(f"⚠️ Schema check failed: {e}")
+        return False
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument("--status", action="store_true", help="show the current version and exit")
+    parser.add_argument("--target", type=int, help="migrate up to this version only")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        logger.error("Database connection could not be established.")
+        return 1
+
+    try:
+        if args.status:
+            cur = conn.cursor()
+            version = get_schema_version(cur)
+            cur.close()
+            logger.info(f"Schema version: {version or 0} (latest: {LATEST_VERSION})")
+            return 0
+
+        applied = migrate(conn, args.target)
+        if applied:
+            logger.success(f"Applied migrations: {', '.join(map(str, applied))}")
+        else:
+            logger.info("Database schema is already up to date.")
+        return 0
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
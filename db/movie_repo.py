@@ -1,12 +1,108 @@
-from db.connection import get_db_connection
+import re
+
+from db.connection import db_connection
+
+# Grid cards only show a two-line elided description, so the page query ships
+# a bounded prefix instead of the full text.
+CARD_DESCRIPTION_CHARS = 160
+CARD_COLUMNS = f"id, title, genre, duration, LEFT(description, {CARD_DESCRIPTION_CHARS}), poster_link"
+
+# Movies dropped from the catalog feed are retired, not deleted (see scripts/import_movies.py)
+CATALOG_IDS_SQL = "SELECT id FROM movies WHERE retired_at IS NULL ORDER BY id"
+CARDS_BY_ID_SQL = f"SELECT {CARD_COLUMNS} FROM movies WHERE id = ANY(%s)"
+
+# A movie matches when every search word is a prefix of a word in its title,
+# genre or description (movies_search_idx), or when the query is close to a
+# word sequence in the title (pg_trgm word similarity, movies_title_trgm_idx).
+# Title hits outrank genre hits, which outrank description hits.
+SEARCH_MATCH = """
+    retired_at IS NULL
+    AND (search_vector @@ to_tsquery('english', %(prefix)s) OR %(text)s <%% title)
+"""
+SEARCH_ORDER = """
+    ts_rank_cd(search_vector, to_tsquery('english', %(prefix)s))
+    + word_similarity(%(text)s, title) DESC,
+    id
+"""
+# LIMIT NULL is no limit
+SEARCH_IDS_SQL = f"SELECT id FROM movies WHERE {SEARCH_MATCH} ORDER BY {SEARCH_ORDER} LIMIT %(limit)s"
+
+
+def search_params(text):
+    """Query parameters for SEARCH_IDS_SQL, or None if the text has nothing to search for."""
+    words = re.findall(r"[^\W_]+", text.lower())
+    if not words:
+        return None
+    return {"text": " ".join(words), "prefix": " & ".join(f"{w}:*" for w in words)}
+
 
 class MovieRepo:
     def get_all_movies(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        # ENSURE 'poster_link' IS THE 6TH COLUMN
-        cursor.execute("SELECT id, title, genre, duration, description, poster_link FROM movies")
-        movies = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return movies
\ No newline at end of file
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                # ENSURE 'poster_link' IS THE 6TH COLUMN
+                cursor.execute(
+                    "SELECT id, title, genre, duration, description, poster_link FROM movies "
+                    "WHERE retired_at IS NULL"
+                )
+                return cursor.fetchall()
+
+    def get_catalog(self):
+        """Every active movie as a grid-card row followed by director and stars, ordered by id."""
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {CARD_COLUMNS}, director, stars FROM movies "
+                    "WHERE retired_at IS NULL ORDER BY id"
+                )
+                return cursor.fetchall()
+
+    def get_movie_ids(self):
+        """Ids of every active movie in catalog order, for the virtualized grid."""
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(CATALOG_IDS_SQL)
+                return [row[0] for row in cursor.fetchall()]
+
+    def get_movie_cards(self, movie_ids):
+        """Grid-card rows for the given ids, in no particular order.
+
+        Rows keep the get_all_movies() column order, with the description
+        truncated to CARD_DESCRIPTION_CHARS.
+        """
+        if not movie_ids:
+            return []
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(CARDS_BY_ID_SQL, (list(movie_ids),))
+                return cursor.fetchall()
+
+    def count_movies(self):
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM movies WHERE retired_at IS NULL")
+                return cursor.fetchone()[0]
+
+    def search_ids(self, text, limit=None):
+        """Ids of the movies matching `text`, best matches first; all of them unless `limit` is given."""
+        params = search_params(text)
+        if params is None:
+            return []
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(SEARCH_IDS_SQL, {**params, "limit": limit})
+                return [row[0] for row in cursor.fetchall()]
+
+    def get_movie_description(self, movie_id):
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT description FROM movies WHERE id = %s", (movie_id,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+
+    def get_poster_link(self, movie_id):
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT poster_link FROM movies WHERE id = %s", (movie_id,))
+                row = cursor.fetchone()
+                return row[0] if row else None
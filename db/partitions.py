@@ -0,0 +1,184 @@
+import sys
+import os
+import argparse
+from datetime import date
+from loguru import logger
+
+# Add project root to sys.path to import config/db
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection import get_db_connection
+
+# Range-partitioned by the month the show starts in (showtimes.start_time,
+# bookings/booked_seats.showtime_start), referenced tables first. Partitions
+# are named <table>_YYYY_MM.
+PARTITIONED_TABLES = ("showtimes", "bookings", "booked_seats")
+FUTURE_MONTHS = 12
+ARCHIVE_SCHEMA = "archive"
+
+# Partitions are created by the database function
+# ensure_month_partitions(first_month, last_month), installed by migration 8:
+# it adds the missing monthly partitions of every table above for
+# [first_month, last_month] and is safe to call from several sessions at once.
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y_%m}"
+
+
+def ensure_partitions(cur, first, last=None):
+    """Creates the monthly partitions covering [first, last] and returns how many were added.
+
+    Call this before loading showtimes outside the window kept ready by
+    ensure_future_partitions(), otherwise the rows have no partition to go to.
+    """
+    cur.execute("SELECT ensure_month_partitions(%s::date, %s::date)", (first, last or first))
+    return cur.fetchone()[0]
+
+
+def ensure_future_partitions(cur, months=FUTURE_MONTHS):
+    """Keeps partitions ready from the current month to `months` months ahead."""
+    today = month_start(date.today())
+    return ensure_partitions(cur, today, add_months(today, months))
+
+
+def maintain_future_partitions():
+    """Startup hook: tops the partitions up to FUTURE_MONTHS ahead, in its own transaction.
+
+    There is no DEFAULT partition, so a showtime or booking in a month
+    without one is rejected. Running this on every app start (migrate() does
+    the same) keeps the window from running out when the monthly cron job
+    does not run. Returns False, after logging why, if it could not.
+    """
+    conn = get_db_connection()
+    if conn is None:
+        logger.warning("Could not check the monthly partitions: no database connection.")
+        return False
+    try:
+        cur = conn.cursor()
+        created = ensure_future_partitions(cur)
+        conn.commit()
+        if created:
+            logger.info(f"Created {created} partition(s) for the coming months.")
+        return True
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Could not create the coming months' partitions: {e}. Run: python -m db.partitions")
+        return False
+    finally:
+        conn.close()
+
+
+def list_partitions(cur, table="showtimes"):
+    """Returns (name, bounds, estimated rows) for every partition of `table`."""
+    cur.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        ORDER BY c.relname
+        """,
+        (table,),
+    )
+    return cur.fetchall()
+
+
+def archive_month(cur, month, drop=False):
+    """Detaches one month from every partitioned table, then drops it or moves it to ARCHIVE_SCHEMA.
+
+    Detaching only rewrites catalog entries, so this takes the same time for
+    an empty month as for a sold-out one. Referencing tables go first so the
+    foreign keys never point at a missing month. Returns the tables handled.
+    """
+    month = month_start(month)
+    handled = []
+    if not drop:
+        cur.execute(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, month)
+        cur.execute("SELECT to_regclass(%s)", (name,))
+        if cur.fetchone()[0] is None:
+            continue
+
+        cur.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+        if drop:
+            cur.execute(f"DROP TABLE {name}")
+        else:
+            # The detached copy keeps its foreign keys into the live tables,
+            # which would block detaching the month it references next.
+            cur.execute(
+                """
+                SELECT conname FROM pg_constraint
+                WHERE conrelid = %s::regclass AND contype = 'f'
+                  AND confrelid = ANY(%s::regclass[])
+                """,
+                (name, list(PARTITIONED_TABLES)),
+            )
+            for (constraint,) in cur.fetchall():
+                cur.execute(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"')
+            cur.execute(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}")
+        handled.append(name)
+    return handled
+
+
+def _month(value):
+    return date.fromisoformat(value + "-01")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the monthly showtime and booking partitions.")
+    parser.add_argument("--ahead", type=int, default=FUTURE_MONTHS,
+                        help="create partitions up to this many months ahead (default: %(default)s)")
+    parser.add_argument("--list", action="store_true", help="list the showtime partitions and exit")
+    parser.add_argument("--archive", type=_month, metavar="YYYY-MM",
+                        help=f"detach this month into the '{ARCHIVE_SCHEMA}' schema")
+    parser.add_argument("--drop", action="store_true", help="with --archive, drop the month instead")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        logger.error("Database connection could not be established.")
+        return 1
+
+    try:
+        cur = conn.cursor()
+        if args.list:
+            for name, bounds, rows in list_partitions(cur):
+                logger.info(f"{name}: {bounds} (~{max(rows, 0):,} rows)")
+            return 0
+
+        if args.archive:
+            handled = archive_month(cur, args.archive, drop=args.drop)
+            conn.commit()
+            if handled:
+                verb = "Dropped" if args.drop else f"Archived into {ARCHIVE_SCHEMA}:"
+                logger.success(f"{verb} {', '.join(handled)}")
+            else:
+                logger.info(f"No partitions for {args.archive:%Y-%m}.")
+            return 0
+
+        created = ensure_future_partitions(cur, args.ahead)
+        conn.commit()
+        logger.info(f"Created {created} partition(s); partitions exist through {args.ahead} months ahead.")
+        return 0
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Partition maintenance failed: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# Every hall uses the same 8 x 10 layout: rows A-H, seats 1-10. Seat "C5" is
+# bit (2 * SEAT_COLS + 4) of showtimes.seat_map, counting from the leftmost
+# bit, which is the same order seat_index() uses in the database.
+SEAT_ROWS = 8
+SEAT_COLS = 10
+SEAT_COUNT = SEAT_ROWS * SEAT_COLS
+
+
+def seat_index(seat_number):
+    """Maps a seat label such as "C5" to its bit position in the seat map."""
+    row = ord(seat_number[0].upper()) - 65
+    col = int(seat_number[1:]) - 1
+    if not (0 <= row < SEAT_ROWS and 0 <= col < SEAT_COLS):
+        raise ValueError(f"Seat {seat_number!r} is outside the {SEAT_ROWS}x{SEAT_COLS} layout")
+    return row * SEAT_COLS + col
+
+
+def seat_label(index):
+    return f"{chr(65 + index // SEAT_COLS)}{index % SEAT_COLS + 1}"
+
+
+class SeatMap:
+    """Occupancy bitset for one showtime, decoded from showtimes.seat_map."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @classmethod
+    def from_db(cls, value):
+        """Decodes the '0101...' string psycopg2 returns for a BIT(n) column."""
+        if not value:
+            return cls()
+        # Pad/trim to the layout width so bit 0 is always the leftmost seat
+        value = value[:SEAT_COUNT].ljust(SEAT_COUNT, "0")
+        return cls(int(value, 2))
+
+    @classmethod
+    def from_seats(cls, seat_numbers):
+        bits = 0
+        for seat in seat_numbers:
+            bits |= 1 << (SEAT_COUNT - 1 - seat_index(seat))
+        return cls(bits)
+
+    def is_taken(self, index):
+        return bool(self.bits >> (SEAT_COUNT - 1 - index) & 1)
+
+    def __contains__(self, seat_number):
+        try:
+            return self.is_taken(seat_index(seat_number))
+        except (ValueError, IndexError):
+            return False
+
+    def __iter__(self):
+        for index in range(SEAT_COUNT):
+            if self.is_taken(index):
+                yield seat_label(index)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __repr__(self):
+        return f"SeatMap({list(self)!r})"
\ No newline at end of file
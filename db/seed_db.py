@@ -1,4 +1,5 @@
 from db.connection import get_db_connection
+from db.partitions import ensure_partitions
 
 
 def seed_data():
@@ -23,7 +24,7 @@ def seed_data():
 
         for title, genre, duration, desc in movies:
             cur.execute("""
-                INSERT INTO movies (title, genre, duration_minutes, description) 
+                INSERT INTO movies (title, genre, duration, description) 
                 VALUES (%s, %s, %s, %s)
                 ON CONFLICT DO NOTHING;
             """, (title, genre, duration, desc))
@@ -40,6 +41,7 @@ def seed_data():
         # Add a showtime for each movie
         # Format: YYYY-MM-DD HH:MM:SS
         times = ["2026-01-14 18:00:00", "2026-01-14 21:00:00"]
+        ensure_partitions(cur, times[0][:10], times[-1][:10])
 
         for i, (movie_id, title) in enumerate(movie_rows):
             if i < len(times):
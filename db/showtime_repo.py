@@ -0,0 +1,67 @@
+from db.connection import db_connection
+from db.seat_map import SeatMap
+
+# Dates are matched as a [day, day + 1) range on start_time rather than with
+# start_time::date, so showtimes_movie_start_idx can serve the lookup.
+SHOW_DATES_SQL = """
+    SELECT DISTINCT start_time::date FROM showtimes
+    WHERE movie_id = %s ORDER BY start_time::date
+"""
+
+SHOWTIMES_SQL = """
+    SELECT id, hall_id, start_time, price
+    FROM showtimes
+    WHERE movie_id = %s
+      AND start_time >= %s::date AND start_time < %s::date + 1
+    ORDER BY start_time
+"""
+
+TAKEN_SEATS_SQL = """
+    SELECT seat_number FROM booked_seats
+    WHERE showtime_id = %s
+"""
+
+SEAT_MAP_SQL = "SELECT seat_map FROM showtimes WHERE id = %s"
+
+# The tables are partitioned by month (db/partitions.py). Given the show's
+# start time as well, a lookup by id touches a single partition.
+TAKEN_SEATS_PRUNED_SQL = TAKEN_SEATS_SQL + "  AND showtime_start = %s\n"
+SEAT_MAP_PRUNED_SQL = SEAT_MAP_SQL + " AND start_time = %s"
+
+
+class ShowtimeRepo:
+    def get_show_dates(self, movie_id):
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SHOW_DATES_SQL, (movie_id,))
+                return [r[0] for r in cur.fetchall()]
+
+    def get_showtimes(self, movie_id, show_date):
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SHOWTIMES_SQL, (movie_id, show_date, show_date))
+                return cur.fetchall()
+
+    def get_taken_seats(self, showtime_id, start_time=None):
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                if start_time is None:
+                    cur.execute(TAKEN_SEATS_SQL, (showtime_id,))
+                else:
+                    cur.execute(TAKEN_SEATS_PRUNED_SQL, (showtime_id, start_time))
+                return [r[0] for r in cur.fetchall()]
+
+    def get_seat_map(self, showtime_id, start_time=None):
+        """Returns the SeatMap of taken seats, read from the trigger-maintained bitmap.
+
+        Pass the showtime's start_time when it is known so that only its
+        month's partition is searched.
+        """
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                if start_time is None:
+                    cur.execute(SEAT_MAP_SQL, (showtime_id,))
+                else:
+                    cur.execute(SEAT_MAP_PRUNED_SQL, (showtime_id, start_time))
+                row = cur.fetchone()
+                return SeatMap.from_db(row[0] if row else None)
\ No newline at end of file
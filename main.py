@@ -10,12 +10,14 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from views.start_window import StartWindow
 from config import settings
-from db.connection import verify_database_schema
+from db.migrations import verify_database_schema
+from db.partitions import maintain_future_partitions
 from ui.fonts import load_custom_fonts
 
 
 def main():
-    verify_database_schema()
+    if verify_database_schema():
+        maintain_future_partitions()
 
     app = QApplication(sys.argv)
     app.setApplicationName(settings.app_name)
@@ -0,0 +1,370 @@
+import argparse
+import json
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+from config import settings
+from db.booking_repo import BookingRepo
+from db.bulk import copy_rows
+from db.connection import get_db_connection, get_pool
+from db.migrations import LATEST_VERSION, migrate
+from db.movie_repo import MovieRepo
+from db.partitions import ensure_partitions
+from db.seat_map import SEAT_COLS, SEAT_COUNT, SeatMap, seat_label
+from db.showtime_repo import ShowtimeRepo
+from db.user_repo import UserRepo
+from scripts.seed_schedule import build_schedule, ensure_halls
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Sci-Fi", "Animation", "Romance"]
+WORDS = ("a young hero must face the past when an old friend returns to the city "
+         "and a secret war between two families threatens everything they love").split()
+
+# A case only counts as regressed when it is both this much slower relatively
+# and absolutely, so sub-millisecond jitter does not fail a run.
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MIN_DELTA_MS = 0.5
+# Ids per get_movie_cards() call: one MovieListModel block of the grid
+CARD_BLOCK = 100
+
+
+def _admin_connection():
+    """Connection to the server's maintenance database, used to create and drop the bench DB."""
+    conn = psycopg2.connect(
+        host=settings.db.DB_HOST,
+        port=settings.db.DB_PORT,
+        user=settings.db.DB_USER,
+        password=settings.db.DB_PASSWORD,
+        dbname="postgres",
+    )
+    conn.autocommit = True
+    return conn
+
+
+def create_bench_database(name):
+    conn = _admin_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+            cur.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        conn.close()
+
+
+def drop_bench_database(name):
+    get_pool().close()
+    conn = _admin_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+    finally:
+        conn.close()
+
+
+def seed_bench_database(movies, users, halls, months, occupancy, seed):
+    """Fills a freshly migrated database with a synthetic catalog, schedule and bookings."""
+    rng = random.Random(seed)
+    conn = get_db_connection()
+    if conn is None:
+        return None
+
+    try:
+        migrate(conn)
+        cur = conn.cursor()
+
+        print(f"👤 {users:,} users...")
+        copy_rows(cur, "users", ("username", "password_hash", "first_name", "last_name"), (
+            (f"user{n:06d}", "bench", "Bench", f"User {n}") for n in range(1, users + 1)
+        ))
+
+        print(f"🎬 {movies:,} movies...")
+        copy_rows(cur, "movies", ("title", "description", "duration", "genre", "released_year", "poster_link"), (
+            (
+                f"Benchmark Movie {n}",
+                " ".join(rng.choices(WORDS, k=rng.randint(20, 60))).capitalize() + ".",
+                rng.randint(80, 180),
+                rng.choice(GENRES),
+                rng.randint(1950, 2025),
+                "",
+            )
+            for n in range(1, movies + 1)
+        ))
+
+        cur.execute("SELECT id, duration FROM movies ORDER BY id")
+        all_movies = cur.fetchall()
+        hall_ids = ensure_halls(cur, halls)
+        start_date = datetime.now().date() + timedelta(days=1)
+        movie_col, hall_col, start_col, end_col, price_col = build_schedule(
+            [m[0] for m in all_movies], [m[1] for m in all_movies], hall_ids, start_date,
+            months=months, seed=seed,
+        )
+        print(f"📅 {len(movie_col):,} showtimes...")
+        ensure_partitions(cur, start_date, str(start_col.max().astype("datetime64[D]")))
+        copy_rows(cur, "showtimes", ("movie_id", "hall_id", "start_time", "end_time", "price"), zip(
+            movie_col.tolist(),
+            hall_col.tolist(),
+            np.datetime_as_string(start_col, unit="m").tolist(),
+            np.datetime_as_string(end_col, unit="m").tolist(),
+            price_col.tolist(),
+        ))
+
+        # One booking per showtime holding roughly `occupancy` of its seats;
+        # the seat_map triggers fill in the bitmaps as the seats go in.
+        print(f"🎟️ Booking ~{occupancy:.0%} of every showtime...")
+        cur.execute("SELECT setseed(%s)", (seed % 1000 / 1000,))
+        cur.execute("""
+            INSERT INTO bookings (user_id, showtime_id, showtime_start, total_price)
+            SELECT (SELECT min(id) FROM users), id, start_time, price FROM showtimes
+        """)
+        cur.execute(f"""
+            INSERT INTO booked_seats (booking_id, showtime_id, showtime_start, seat_number)
+            SELECT b.id, b.showtime_id, b.showtime_start, chr(65 + seat / {SEAT_COLS}) || (seat %% {SEAT_COLS} + 1)
+            FROM bookings b, generate_series(0, {SEAT_COUNT - 1}) AS seat
+            WHERE random() < %s
+        """, (occupancy,))
+        conn.commit()
+
+        cur.execute("ANALYZE")
+        conn.commit()
+        cur.execute("SELECT count(*) FROM showtimes")
+        showtimes = cur.fetchone()[0]
+        cur.execute("SELECT count(*) FROM booked_seats")
+        booked = cur.fetchone()[0]
+        cur.close()
+        return {"movies": movies, "users": users, "halls": len(hall_ids), "months": months,
+                "showtimes": showtimes, "booked_seats": booked}
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def load_parameters(samples, seed):
+    """Picks realistic arguments for every case from the seeded data."""
+    rng = random.Random(seed)
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT username FROM users ORDER BY random() LIMIT %s", (samples,))
+        usernames = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT min(id) FROM users")
+        user_id = cur.fetchone()[0]
+        cur.execute("SELECT id FROM movies ORDER BY id")
+        movie_ids = [r[0] for r in cur.fetchall()]
+        cur.execute(
+            "SELECT id, movie_id, start_time, seat_map FROM showtimes ORDER BY random() LIMIT %s",
+            (samples,),
+        )
+        showtimes = cur.fetchall()
+        cur.close()
+    finally:
+        conn.rollback()
+        conn.close()
+
+    # Every create_booking call takes a seat nobody holds yet, so all of them commit
+    free_seats = []
+    for showtime_id, _, start_time, seat_map in showtimes:
+        taken = SeatMap.from_db(seat_map)
+        free_seats.extend(
+            (showtime_id, start_time, seat_label(i)) for i in range(SEAT_COUNT) if not taken.is_taken(i)
+        )
+    rng.shuffle(free_seats)
+
+    # What search-as-you-type sends: whole words and their prefixes
+    searches = [w[:rng.randint(3, len(w))] for w in rng.choices(WORDS, k=samples) if len(w) >= 3]
+
+    return {
+        "user_id": user_id,
+        "usernames": usernames,
+        "card_blocks": [movie_ids[s:s + CARD_BLOCK] for s in range(0, len(movie_ids), CARD_BLOCK)],
+        "searches": searches,
+        "movie_days": [(movie_id, start.date()) for _, movie_id, start, _ in showtimes],
+        # (id, start_time), the way ShowtimeView asks for a seat map
+        "showtimes": [(s[0], s[2]) for s in showtimes],
+        "free_seats": free_seats,
+    }
+
+
+def bench_cases(params):
+    """(name, callable(i)) pairs; `i` picks the argument for the i-th call."""
+    movie_repo = MovieRepo()
+    user_repo = UserRepo()
+    showtime_repo = ShowtimeRepo()
+    booking_repo = BookingRepo()
+
+    def pick(values, i):
+        return values[i % len(values)]
+
+    def book(i):
+        showtime_id, start_time, seat = params["free_seats"].pop()
+        result = booking_repo.create_booking(params["user_id"], showtime_id, [seat], 15.0, start_time)
+        if result is None or not result.ok:
+            raise RuntimeError(f"Benchmark booking of {seat} for showtime {showtime_id} failed")
+
+    return [
+        ("MovieRepo.get_all_movies", lambda i: movie_repo.get_all_movies()),
+        ("MovieRepo.get_movie_ids", lambda i: movie_repo.get_movie_ids()),
+        ("MovieRepo.get_movie_cards", lambda i: movie_repo.get_movie_cards(pick(params["card_blocks"], i))),
+        ("MovieRepo.search_ids", lambda i: movie_repo.search_ids(pick(params["searches"], i))),
+        ("UserRepo.get_user_by_username", lambda i: user_repo.get_user_by_username(pick(params["usernames"], i))),
+        ("ShowtimeRepo.get_show_dates", lambda i: showtime_repo.get_show_dates(pick(params["movie_days"], i)[0])),
+        ("ShowtimeRepo.get_showtimes", lambda i: showtime_repo.get_showtimes(*pick(params["movie_days"], i))),
+        ("ShowtimeRepo.get_seat_map", lambda i: showtime_repo.get_seat_map(*pick(params["showtimes"], i))),
+        ("BookingRepo.create_booking", book),
+    ]
+
+
+def summarize(timings):
+    ms = np.asarray(timings) / 1e6
+    return {
+        "calls": len(ms),
+        "min_ms": round(float(ms.min()), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def run_cases(cases, iterations, warmup):
+    results = {}
+    for name, call in cases:
+        for i in range(warmup):
+            call(i)
+        timings = []
+        for i in range(warmup, warmup + iterations):
+            started = time.perf_counter_ns()
+            call(i)
+            timings.append(time.perf_counter_ns() - started)
+        results[name] = summarize(timings)
+        stats = results[name]
+        print(f"   {name:<32} p50 {stats['p50_ms']:>8.3f} ms   p95 {stats['p95_ms']:>8.3f} ms")
+    return results
+
+
+def compare_runs(baseline, current, metric="p50_ms", threshold=DEFAULT_THRESHOLD,
+                 min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """Prints a per-case comparison and returns the names of regressed cases."""
+    regressions = []
+    print(f"\n📊 {metric} against {baseline.get('created_at', 'baseline')}:")
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"   {name:<32} (new)")
+            continue
+        old, new = before[metric], stats[metric]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > min_delta_ms
+        marker = "❌" if regressed else "✅"
+        print(f"   {marker} {name:<30} {old:>8.3f} → {new:>8.3f} ms ({change:+.1%})")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def run_benchmarks(args):
+    settings.db.DB_NAME = args.db_name
+    print(f"🧪 Creating benchmark database {args.db_name}...")
+    create_bench_database(args.db_name)
+    try:
+        sizes = seed_bench_database(args.movies, args.users, args.halls, args.months,
+                                    args.occupancy, args.seed)
+        if sizes is None:
+            return None
+        needed = args.warmup + args.iterations
+        params = load_parameters(max(args.samples, needed // (SEAT_COUNT // 2) + 1), args.seed)
+        if len(params["free_seats"]) < needed:
+            print("❌ Not enough free seats for the booking case, lower --occupancy or --iterations.")
+            return None
+
+        print(f"\n⏱️ {args.iterations} calls per case after {args.warmup} warm-up calls:")
+        results = run_cases(bench_cases(params), args.iterations, args.warmup)
+
+        with get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SHOW server_version")
+                server_version = cur.fetchone()[0]
+            conn.rollback()
+    finally:
+        if args.keep_db:
+            print(f"\n💾 Kept benchmark database {args.db_name}.")
+        else:
+            drop_bench_database(args.db_name)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "server_version": server_version,
+        "schema_version": LATEST_VERSION,
+        "sizes": sizes,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "results": results,
+    }
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the repository queries against a disposable, seeded PostgreSQL database."
+    )
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--halls", type=int, default=10)
+    parser.add_argument("--months", type=int, default=3, help="months of showtimes to schedule")
+    parser.add_argument("--occupancy", type=float, default=0.3, help="share of seats booked up front (0-1)")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per case")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed calls per case")
+    parser.add_argument("--samples", type=int, default=200, help="distinct arguments drawn per case")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-name", default="cinema_bench", help="database to create and drop")
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the database afterwards")
+    parser.add_argument("--output", metavar="PATH",
+                        help="where to write the JSON report (default: benchmarks/<timestamp>.json)")
+    parser.add_argument("--baseline", metavar="PATH", help="earlier report to check for regressions")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="only compare two saved reports, do not run anything")
+    parser.add_argument("--metric", choices=("p50_ms", "p95_ms", "mean_ms"), default="p50_ms")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, report = (load_report(p) for p in args.compare)
+    else:
+        if args.db_name == settings.db.DB_NAME:
+            print(f"❌ Refusing to benchmark in {args.db_name}: it would be dropped afterwards.")
+            sys.exit(1)
+        report = run_benchmarks(args)
+        if report is None:
+            sys.exit(1)
+        output = args.output or os.path.join(
+            BASE_DIR, "benchmarks", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Results written to {output}")
+        baseline = load_report(args.baseline) if args.baseline else None
+
+    if baseline is not None:
+        regressions = compare_runs(baseline, report, args.metric, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
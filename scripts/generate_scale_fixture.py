@@ -0,0 +1,286 @@
+import argparse
+import math
+import sys
+import os
+import time
+from datetime import date, timedelta
+import numpy as np
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+from db.bulk import copy_rows
+from db.connection import get_db_connection
+from db.migrations import migrate
+from db.partitions import ensure_partitions
+from db.seat_map import SEAT_COLS, SEAT_COUNT, SEAT_ROWS, seat_label
+
+GENRES = np.array(["Drama", "Comedy", "Action", "Thriller", "Horror", "Sci-Fi", "Animation", "Romance",
+                   "Crime", "Adventure", "Documentary", "Family"])
+CERTIFICATES = np.array(["U", "UA", "A", "PG-13", "R", "G"])
+WORDS = ("a young hero must face the past when an old friend returns to the city and a secret "
+         "war between two families threatens everything they love while a detective chases the "
+         "truth across a frozen country").split()
+
+# Every hall runs four fixed slots a day; a slot fits the longest movie plus cleaning
+SLOT_STARTS = np.array([10 * 60, 13 * 60 + 30, 17 * 60, 20 * 60 + 30])
+MIN_DURATION, MAX_DURATION = 80, 200
+
+FIXTURE_USER_PREFIX = "fixture_"
+SEAT_LABELS = np.array([seat_label(i) for i in range(SEAT_COUNT)])
+
+
+def _seat_weights():
+    """Center seats sell first: weight falls off with distance from the middle of the hall."""
+    rows, cols = np.divmod(np.arange(SEAT_COUNT), SEAT_COLS)
+    row_dist = np.abs(rows - (SEAT_ROWS - 1) / 2) / SEAT_ROWS
+    col_dist = np.abs(cols - (SEAT_COLS - 1) / 2) / SEAT_COLS
+    return 1.0 / (0.1 + row_dist + col_dist)
+
+
+SEAT_WEIGHTS = _seat_weights()
+
+
+def movie_popularity(count, skew, rng):
+    """Zipf-like share of showtimes per movie. Hits are spread over random ids, not the first rows."""
+    ranks = rng.permutation(count)
+    weights = 1.0 / (ranks + 1.0) ** skew
+    return weights / weights.sum()
+
+
+def movie_rows(count, durations, popularity, rng):
+    years = rng.integers(1950, 2026, count)
+    genres = GENRES[rng.integers(0, len(GENRES), count)]
+    certificates = CERTIFICATES[rng.integers(0, len(CERTIFICATES), count)]
+    ratings = np.round(rng.normal(6.8, 0.8, count).clip(1.0, 9.9), 1)
+    meta_scores = rng.integers(30, 100, count)
+    votes = (popularity / popularity.max() * 2_500_000).astype(np.int64) + rng.integers(25, 5_000, count)
+    gross = votes * rng.integers(20, 400, count)
+    lengths = rng.integers(15, 70, count)
+    word_picks = rng.integers(0, len(WORDS), lengths.sum())
+
+    offset = 0
+    for n in range(count):
+        words = word_picks[offset:offset + lengths[n]]
+        offset += lengths[n]
+        yield (
+            n + 1,
+            f"Synthetic Movie {n + 1}",
+            " ".join(WORDS[w] for w in words).capitalize() + ".",
+            int(durations[n]),
+            genres[n],
+            int(years[n]),
+            certificates[n],
+            float(ratings[n]),
+            int(meta_scores[n]),
+            f"Director {n % 5_000 + 1}",
+            f"Star {n % 9_973 + 1}, Star {n % 7_919 + 1}",
+            int(votes[n]),
+            int(gross[n]),
+            "",
+        )
+
+
+def pick_seats(counts, rng):
+    """(n, SEAT_COUNT) mask with counts[i] seats taken in row i, weighted towards the center.
+
+    Weighted sampling without replacement: each seat gets the key u ** (1 / w)
+    and the `count` largest keys win.
+    """
+    keys = rng.random((len(counts), SEAT_COUNT)) ** (1.0 / SEAT_WEIGHTS)
+    order = np.argsort(-keys, axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(SEAT_COUNT)[None, :].repeat(len(counts), axis=0), axis=1)
+    return ranks < counts[:, None]
+
+
+def seat_map_strings(mask):
+    """Renders each mask row as the '0101...' text COPY accepts for a BIT(n) column."""
+    digits = np.ascontiguousarray(mask.astype(np.uint8) + ord("0"))
+    return digits.view(f"S{SEAT_COUNT}").ravel().astype(f"U{SEAT_COUNT}").tolist()
+
+
+def build_chunk(first, count, args, layout, fill, booking_base, durations, popularity, user_ids, rng):
+    """Generates showtimes [first, first + count) with their bookings and booked seats.
+
+    Booking ids continue from `booking_base`. Returns the three row iterators
+    and the number of bookings generated.
+    """
+    halls, first_day = layout
+    slots = len(SLOT_STARTS)
+    index = np.arange(first, first + count)
+    day, rest = np.divmod(index, halls * slots)
+    hall, slot = np.divmod(rest, slots)
+
+    movie_idx = rng.choice(len(popularity), count, p=popularity)
+    starts = (first_day + day).astype("datetime64[m]") + SLOT_STARTS[slot]
+    ends = starts + durations[movie_idx]
+    prices = np.round(rng.uniform(12.0, 22.0, count) + (slot >= 2) * 3.0, 2)
+
+    # Hit movies fill up faster and are the ones that sell out
+    heat = popularity[movie_idx] ** 0.25
+    heat /= heat.mean()
+    sold_out = rng.random(count) < np.clip(args.sold_out_share * heat, 0.0, 1.0)
+    counts = np.where(sold_out, SEAT_COUNT, rng.binomial(SEAT_COUNT, np.clip(fill * heat, 0.0, 1.0)))
+    mask = pick_seats(counts, rng)
+
+    showtime_ids = index + 1
+    show_starts = np.datetime_as_string(starts, unit="m")
+    showtimes = zip(
+        showtime_ids.tolist(),
+        (movie_idx + 1).tolist(),
+        (hall + 1).tolist(),
+        show_starts.tolist(),
+        np.datetime_as_string(ends, unit="m").tolist(),
+        prices.tolist(),
+        seat_map_strings(mask),
+    )
+
+    # Seats of one showtime are split into parties; every party is one booking
+    rows, cols = np.nonzero(mask)
+    new_booking = rng.random(len(rows)) < 1.0 / args.party_size
+    if len(rows):
+        new_booking[0] = True
+        new_booking[1:] |= rows[1:] != rows[:-1]
+    booking_local = np.cumsum(new_booking) - 1
+    heads = rows[new_booking]
+    seats_per_booking = np.bincount(booking_local, minlength=len(heads))
+    booked_at = starts[heads] - rng.integers(60, 30 * 24 * 60, len(heads)).astype("timedelta64[m]")
+
+    booking_ids = booking_base + np.arange(len(heads)) + 1
+    bookings = zip(
+        booking_ids.tolist(),
+        user_ids[rng.integers(0, len(user_ids), len(heads))].tolist(),
+        showtime_ids[heads].tolist(),
+        show_starts[heads].tolist(),
+        np.datetime_as_string(booked_at, unit="m").tolist(),
+        np.round(prices[heads] * seats_per_booking, 2).tolist(),
+    )
+    booked_seats = zip(
+        (booking_base + booking_local + 1).tolist(),
+        showtime_ids[rows].tolist(),
+        show_starts[rows].tolist(),
+        SEAT_LABELS[cols].tolist(),
+    )
+    return showtimes, bookings, booked_seats, len(heads)
+
+
+def generate_fixture(args):
+    rng = np.random.default_rng(args.seed)
+    slots = len(SLOT_STARTS)
+    halls = max(1, math.ceil(args.showtimes / (args.days * slots)))
+    avg_seats = args.booked_seats / args.showtimes
+    if avg_seats > SEAT_COUNT:
+        print(f"❌ {args.booked_seats:,} seats do not fit into {args.showtimes:,} showtimes of {SEAT_COUNT}.")
+        return False
+    # Occupancy of the showtimes that are not sold out, so the total lands near --booked-seats
+    unsold_share = max(1e-9, 1 - args.sold_out_share)
+    fill = max(0.0, (avg_seats - args.sold_out_share * SEAT_COUNT) / (unsold_share * SEAT_COUNT))
+
+    conn = get_db_connection()
+    if conn is None:
+        return False
+    cur = conn.cursor()
+    started = time.perf_counter()
+    try:
+        migrate(conn)
+        print("🧹 Clearing movies, halls, showtimes and bookings...")
+        cur.execute("TRUNCATE TABLE movies, halls, showtimes, bookings, booked_seats RESTART IDENTITY CASCADE;")
+        cur.execute("DELETE FROM users WHERE starts_with(username, %s)", (FIXTURE_USER_PREFIX,))
+
+        print(f"👤 {args.users:,} users...")
+        copy_rows(cur, "users", ("username", "password_hash", "first_name", "last_name"), (
+            (f"{FIXTURE_USER_PREFIX}{n:07d}", "fixture", "Fixture", f"User {n}") for n in range(1, args.users + 1)
+        ))
+        cur.execute("SELECT id FROM users WHERE starts_with(username, %s) ORDER BY id", (FIXTURE_USER_PREFIX,))
+        user_ids = np.array([r[0] for r in cur.fetchall()], dtype=np.int64)
+
+        print(f"🎬 {args.movies:,} movies...")
+        popularity = movie_popularity(args.movies, args.movie_skew, rng)
+        durations = rng.integers(MIN_DURATION, MAX_DURATION + 1, args.movies)
+        copy_rows(cur, "movies", (
+            "id", "title", "description", "duration", "genre", "released_year", "certificate",
+            "imdb_rating", "meta_score", "director", "stars", "votes", "gross", "poster_link",
+        ), movie_rows(args.movies, durations, popularity, rng))
+
+        print(f"🏛️ {halls:,} halls...")
+        copy_rows(cur, "halls", ("id", "name", "total_seats"), (
+            (n, f"Hall {n}", SEAT_COUNT) for n in range(1, halls + 1)
+        ))
+        conn.commit()
+
+        print(f"📅 {args.showtimes:,} showtimes over {args.days} days, ~{args.booked_seats:,} booked seats...")
+        layout = (halls, np.datetime64(args.start, "D"))
+        ensure_partitions(cur, args.start, args.start + timedelta(days=args.days))
+        totals = [0, 0, 0]
+        booking_base = 0
+        for first in range(0, args.showtimes, args.chunk):
+            count = min(args.chunk, args.showtimes - first)
+            showtimes, bookings, booked_seats, booking_count = build_chunk(
+                first, count, args, layout, fill, booking_base, durations, popularity, user_ids, rng
+            )
+            booking_base += booking_count
+            # seat_map is written with the showtimes, so the trigger that
+            # would rebuild it from booked_seats is skipped for the load.
+            cur.execute("ALTER TABLE booked_seats DISABLE TRIGGER booked_seats_map_insert")
+            totals[0] += copy_rows(cur, "showtimes", (
+                "id", "movie_id", "hall_id", "start_time", "end_time", "price", "seat_map",
+            ), showtimes)
+            totals[1] += copy_rows(cur, "bookings", (
+                "id", "user_id", "showtime_id", "showtime_start", "booking_date", "total_price",
+            ), bookings)
+            totals[2] += copy_rows(
+                cur, "booked_seats", ("booking_id", "showtime_id", "showtime_start", "seat_number"), booked_seats
+            )
+            cur.execute("ALTER TABLE booked_seats ENABLE TRIGGER booked_seats_map_insert")
+            conn.commit()
+
+            elapsed = time.perf_counter() - started
+            print(f"   {first + count:>12,} showtimes, {totals[2]:>12,} seats "
+                  f"({elapsed:,.0f}s, {totals[2] / elapsed:,.0f} seats/s)")
+
+        for table in ("movies", "halls", "showtimes", "bookings"):
+            cur.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+        conn.commit()
+
+        print("📈 Analyzing...")
+        cur.execute("ANALYZE")
+        conn.commit()
+    except Exception as e:
+        print(f"❌ Fixture generation failed: {e}")
+        conn.rollback()
+        return False
+    finally:
+        cur.close()
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {args.movies:,} movies, {totals[0]:,} showtimes, {totals[1]:,} bookings and "
+          f"{totals[2]:,} booked seats in {elapsed:,.0f}s.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replace the catalog, schedule and bookings with a large synthetic dataset."
+    )
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--showtimes", type=int, default=10_000_000)
+    parser.add_argument("--booked-seats", type=int, default=50_000_000, help="approximate total")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365, help="days the schedule is spread over")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(),
+                        help="first day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--movie-skew", type=float, default=1.0,
+                        help="Zipf exponent of showtimes per movie; 0 spreads them evenly")
+    parser.add_argument("--sold-out-share", type=float, default=0.02,
+                        help="share of showtimes that are completely sold out (0-1)")
+    parser.add_argument("--party-size", type=float, default=2.5, help="average seats per booking")
+    parser.add_argument("--chunk", type=int, default=100_000, help="showtimes generated and loaded per transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sys.exit(0 if generate_fixture(args) else 1)
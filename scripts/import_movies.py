@@ -1,6 +1,10 @@
+import argparse
 import csv
+import hashlib
+import itertools
 import sys
 import os
+import time
 from dotenv import load_dotenv
 
 # 1. Find the path of the main project folder
@@ -13,41 +17,238 @@ sys.path.append(BASE_DIR)
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 # NOW you can do your imports
+from db.bulk import copy_rows
 from db.connection import get_db_connection
 
-def import_imdb_movies(csv_file_path):
+# movies columns filled from the IMDb CSV, in the order parse_movie_row() returns them
+MOVIE_COLUMNS = (
+    "title", "genre", "duration", "description", "poster_link",
+    "released_year", "certificate", "imdb_rating", "meta_score",
+    "director", "stars", "votes", "gross",
+)
+
+
+def _parse_int(value):
+    digits = "".join(filter(str.isdigit, value or ""))
+    return int(digits) if digits else None
+
+
+def _parse_year(value):
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def _parse_rating(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value):
+    value = (value or "").strip()
+    return value or None
+
+
+def parse_movie_row(row):
+    """Turns one IMDb CSV record into a tuple matching MOVIE_COLUMNS."""
+    stars = [s.strip() for s in (row.get(f"Star{i}") for i in range(1, 5)) if s and s.strip()]
+    return (
+        row["Series_Title"].strip(),
+        _text(row.get("Genre")),
+        _parse_int(row.get("Runtime")),         # "142 min"
+        _text(row.get("Overview")),
+        _text(row.get("Poster_Link")),
+        _parse_year(row.get("Released_Year")),  # a few rows carry junk like "PG"
+        _text(row.get("Certificate")),
+        _parse_rating(row.get("IMDB_Rating")),
+        _parse_int(row.get("Meta_score")),
+        _text(row.get("Director")),
+        ", ".join(stars) or None,
+        _parse_int(row.get("No_of_Votes")),
+        _parse_int(row.get("Gross")),           # "28,341,469"
+    )
+
+
+def read_movie_rows(csv_file_path, limit=None):
+    """Lazily yields parsed rows from the IMDb CSV, at most `limit` of them."""
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as f:
+        rows = (parse_movie_row(row) for row in csv.DictReader(f))
+        yield from itertools.islice(rows, limit)
+
+
+def copy_movies(cursor, rows, table="movies", columns=MOVIE_COLUMNS):
+    """Streams rows into `table` with COPY FROM STDIN and returns how many were sent."""
+    return copy_rows(cursor, table, columns, rows)
+
+
+def movie_hash(row):
+    """Digest of every imported field, so a sync can skip rows that did not change."""
+    payload = "\x1f".join("" if value is None else str(value) for value in row)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+# Natural key of a catalog entry; matches the movies_natural_key index
+SAME_MOVIE = "m.title = s.title AND m.released_year IS NOT DISTINCT FROM s.released_year"
+
+# Movies loaded by the old importer have no released_year. Each one takes the
+# year of the feed row with its title that no movie matches yet, pairing
+# repeated titles in order: the old importer inserted them in feed order, so
+# the n-th "Drishyam" by id is the n-th "Drishyam" in the CSV.
+BACKFILL_YEARS_SQL = """
+    UPDATE movies m SET released_year = s.released_year
+    FROM (
+        SELECT id, title, row_number() OVER (PARTITION BY title ORDER BY id) AS n
+        FROM movies WHERE released_year IS NULL
+    ) l
+    JOIN (
+        SELECT title, released_year,
+               row_number() OVER (PARTITION BY title ORDER BY feed_order) AS n
+        FROM movie_import i
+        WHERE NOT EXISTS (
+            SELECT 1 FROM movies k
+            WHERE k.title = i.title AND k.released_year = i.released_year
+        )
+    ) s ON s.title = l.title AND s.n = l.n
+    WHERE m.id = l.id AND s.released_year IS NOT NULL
+"""
+
+
+def sync_imdb_movies(csv_file_path, limit=250, retire_missing=True):
+    """Applies only the differences between the CSV and the movies table.
+
+    Rows are staged with COPY, matched on (title, released_year) and compared
+    by content_hash. New titles are inserted, changed ones updated in place
+    (keeping their ids, showtimes, bookings and cached posters), and titles
+    that left the feed are retired rather than deleted. Movies without a year
+    get theirs from the feed first (BACKFILL_YEARS_SQL), so a database loaded
+    by the old importer keeps its ids too.
+
+    Returns a dict with the titles inserted, updated and retired.
+    """
+    if not os.path.exists(csv_file_path):
+        print(f"❌ Error: Could not find CSV at {csv_file_path}")
+        return None
+
     conn = get_db_connection()
     cursor = conn.cursor()
+    started = time.perf_counter()
 
-    print("🚀 Cleaning database and importing Top 250 movies...")
-    # Truncate ensures we start fresh with ID #1
-    cursor.execute("TRUNCATE TABLE movies RESTART IDENTITY CASCADE;")
+    try:
+        sync_columns = MOVIE_COLUMNS + ("content_hash",)
+        cursor.execute(f"""
+            CREATE TEMP TABLE movie_import ON COMMIT DROP AS
+            SELECT {', '.join(sync_columns)} FROM movies WITH NO DATA
+        """)
+        cursor.execute("ALTER TABLE movie_import ADD COLUMN feed_order SERIAL")
+        rows = read_movie_rows(csv_file_path, limit or None)
+        staged = copy_movies(
+            cursor, ((*row, movie_hash(row)) for row in rows), "movie_import", sync_columns
+        )
+        # Keep the first occurrence if the feed repeats a title
+        cursor.execute(f"""
+            DELETE FROM movie_import s USING movie_import m
+            WHERE {SAME_MOVIE} AND s.feed_order > m.feed_order
+        """)
+        cursor.execute("ANALYZE movie_import")
+        cursor.execute(BACKFILL_YEARS_SQL)
+        if cursor.rowcount:
+            print(f"🗓️ Filled in the release year of {cursor.rowcount} movies.")
+
+        updatable = [c for c in sync_columns if c not in ("title", "released_year")]
+        cursor.execute(f"""
+            UPDATE movies m
+            SET {', '.join(f'{c} = s.{c}' for c in updatable)}, retired_at = NULL
+            FROM movie_import s
+            WHERE {SAME_MOVIE}
+              AND (m.content_hash IS DISTINCT FROM s.content_hash OR m.retired_at IS NOT NULL)
+            RETURNING m.title
+        """)
+        updated = [r[0] for r in cursor.fetchall()]
+
+        cursor.execute(f"""
+            INSERT INTO movies ({', '.join(sync_columns)})
+            SELECT {', '.join(sync_columns)} FROM movie_import s
+            WHERE NOT EXISTS (SELECT 1 FROM movies m WHERE {SAME_MOVIE})
+            RETURNING title
+        """)
+        inserted = [r[0] for r in cursor.fetchall()]
+
+        retired = []
+        if retire_missing:
+            cursor.execute(f"""
+                UPDATE movies m SET retired_at = now()
+                WHERE m.retired_at IS NULL
+                  AND NOT EXISTS (SELECT 1 FROM movie_import s WHERE {SAME_MOVIE})
+                RETURNING m.title
+            """)
+            retired = [r[0] for r in cursor.fetchall()]
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Sync failed: {e}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
 
+    elapsed = time.perf_counter() - started
+    unchanged = staged - len(inserted) - len(updated)
+    print(f"✅ Synced {staged} rows in {elapsed:.2f}s: {len(inserted)} inserted, "
+          f"{len(updated)} updated, {len(retired)} retired, {unchanged} unchanged.")
+    for label, titles in (("+", inserted), ("~", updated), ("-", retired)):
+        for title in titles[:10]:
+            print(f"   {label} {title}")
+        if len(titles) > 10:
+            print(f"   {label} ... and {len(titles) - 10} more")
+
+    return {"inserted": inserted, "updated": updated, "retired": retired}
+
+
+def import_imdb_movies(csv_file_path, limit=250):
     if not os.path.exists(csv_file_path):
         print(f"❌ Error: Could not find CSV at {csv_file_path}")
         return
 
-    with open(csv_file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        count = 0
-        for row in reader:
-            if count >= 250:
-                break
-
-            cursor.execute("""
-                INSERT INTO movies (title, genre, duration, description, poster_link)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (row['Series_Title'], row['Genre'],
-                  int(''.join(filter(str.isdigit, row['Runtime']))),
-                  row['Overview'], row['Poster_Link']))
-            count += 1
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    label = f"Top {limit}" if limit else "all"
+    print(f"🚀 Cleaning database and importing {label} movies...")
+    started = time.perf_counter()
+    # Truncate ensures we start fresh with ID #1. This also wipes every
+    # showtime and booking; use sync_imdb_movies() on a live database.
+    cursor.execute("TRUNCATE TABLE movies RESTART IDENTITY CASCADE;")
+
+    sync_columns = MOVIE_COLUMNS + ("content_hash",)
+    rows = read_movie_rows(csv_file_path, limit or None)
+    count = copy_movies(cursor, ((*row, movie_hash(row)) for row in rows), columns=sync_columns)
 
     conn.commit()
     cursor.close()
     conn.close()
-    print(f"✅ Successfully imported {count} movies into the database.")
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"✅ Successfully imported {count} movies into the database "
+          f"in {elapsed:.2f}s ({rate:,.0f} rows/s).")
 
 if __name__ == "__main__":
     # Points to the new data folder location
     DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'imdb_top_1000.csv')
-    import_imdb_movies(DATA_PATH)
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Import the IMDb catalog into the movies table.")
+    parser.add_argument("csv_path", nargs="?", default=DATA_PATH)
+    parser.add_argument("--limit", type=int, default=250,
+                        help="number of rows to import, 0 for the whole file (default: 250)")
+    parser.add_argument("--mode", choices=("sync", "reload"), default="sync",
+                        help="sync applies only the changes (default); reload truncates "
+                             "movies and every showtime and booking first")
+    parser.add_argument("--keep-missing", action="store_true",
+                        help="sync: do not retire movies that are missing from the CSV")
+    args = parser.parse_args()
+
+    if args.mode == "reload":
+        import_imdb_movies(args.csv_path, args.limit)
+    else:
+        sync_imdb_movies(args.csv_path, args.limit, retire_missing=not args.keep_missing)
\ No newline at end of file
@@ -0,0 +1,252 @@
+import argparse
+import json
+import math
+import random
+import sys
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+from config import settings
+from db.booking_repo import BookingRepo
+from db.connection import db_connection, get_pool
+from db.seat_map import SEAT_COLS, SEAT_COUNT, SEAT_ROWS, seat_label
+from db.showtime_repo import ShowtimeRepo
+
+
+def _seat_weights(mode):
+    """Relative popularity of every seat index for a seat-choice distribution."""
+    weights = []
+    for index in range(SEAT_COUNT):
+        row, col = divmod(index, SEAT_COLS)
+        if mode == "uniform":
+            weight = 1.0
+        elif mode == "center":
+            # Middle rows and columns go first, the edges last
+            row_dist = abs(row - (SEAT_ROWS - 1) / 2) / SEAT_ROWS
+            col_dist = abs(col - (SEAT_COLS - 1) / 2) / SEAT_COLS
+            weight = 1.0 / (0.05 + row_dist + col_dist) ** 2
+        elif mode == "back":
+            weight = float(row + 1) ** 2
+        else:
+            raise ValueError(f"Unknown seat distribution: {mode}")
+        weights.append(weight)
+    return weights
+
+
+def pick_seats(rng, taken, count, weights):
+    """Picks up to `count` free seats, weighted by popularity."""
+    free = [i for i in range(SEAT_COUNT) if not taken.is_taken(i)]
+    picked = []
+    while free and len(picked) < count:
+        index = rng.choices(free, weights=[weights[i] for i in free])[0]
+        free.remove(index)
+        picked.append(seat_label(index))
+    return picked
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile: the smallest value with at least pct% of the values at or below it."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def load_showtimes(count, showtime_ids=None):
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            if showtime_ids:
+                cur.execute("SELECT id, price, start_time FROM showtimes WHERE id = ANY(%s)", (showtime_ids,))
+            else:
+                cur.execute(
+                    "SELECT id, price, start_time FROM showtimes WHERE start_time > now() "
+                    "ORDER BY start_time LIMIT %s",
+                    (count,),
+                )
+            showtimes = cur.fetchall()
+            cur.execute("SELECT id FROM users ORDER BY id")
+            user_ids = [r[0] for r in cur.fetchall()]
+    return showtimes, user_ids
+
+
+class Customer(threading.Thread):
+    """One simulated customer: open a showtime, look at the seat map, think, book."""
+
+    def __init__(self, number, args, showtimes, user_ids, weights, deadline, results):
+        super().__init__(name=f"customer-{number}", daemon=True)
+        self.rng = random.Random(args.seed * 10_007 + number)
+        self.args = args
+        self.showtimes = showtimes
+        self.user_ids = user_ids
+        self.weights = weights
+        self.deadline = deadline
+        self.results = results
+        self.booking_repo = BookingRepo()
+        self.showtime_repo = ShowtimeRepo()
+
+    def _choose_showtime(self):
+        if self.args.hot_share > 0 and self.rng.random() < self.args.hot_share:
+            return self.showtimes[0]  # premiere night: one showtime takes most of the traffic
+        return self.rng.choice(self.showtimes)
+
+    def run(self):
+        attempts = 0
+        while time.monotonic() < self.deadline and attempts < self.args.bookings:
+            attempts += 1
+            showtime_id, price, start_time = self._choose_showtime()
+            want = self.rng.randint(self.args.min_seats, self.args.max_seats)
+
+            started = time.perf_counter()
+            try:
+                taken = self.showtime_repo.get_seat_map(showtime_id, start_time)
+            except Exception as e:
+                # Not a booking attempt, and its latency is not a seat map read either
+                print(f"Seat map error: {e}")
+                self.results.append(("map_error", None, None, None))
+                continue
+            map_latency = time.perf_counter() - started
+
+            seats = pick_seats(self.rng, taken, want, self.weights)
+            if not seats:
+                self.results.append(("sold_out", 0.0, map_latency, None))
+                continue
+
+            if self.args.think_time > 0:
+                time.sleep(self.rng.expovariate(1.0 / self.args.think_time))
+
+            started = time.perf_counter()
+            result = self.booking_repo.create_booking(
+                self.rng.choice(self.user_ids), showtime_id, seats, float(price) * len(seats), start_time
+            )
+            latency = time.perf_counter() - started
+
+            if result is None:
+                outcome = "error"
+            elif result.ok:
+                outcome = "booked"
+            else:
+                outcome = "conflict"
+            self.results.append((outcome, latency, map_latency, result.booking_id if result else None))
+
+
+def run_load_test(args):
+    settings.db.DB_POOL_MAX_SIZE = args.pool_size
+    settings.db.DB_POOL_MIN_SIZE = min(settings.db.DB_POOL_MIN_SIZE, args.pool_size)
+
+    showtimes, user_ids = load_showtimes(args.showtimes, args.showtime_ids)
+    if not showtimes or not user_ids:
+        print("❌ Need at least one upcoming showtime and one user. Seed the database first.")
+        return None
+
+    weights = _seat_weights(args.seat_distribution)
+    results = []
+    deadline = time.monotonic() + args.duration
+    customers = [
+        Customer(n, args, showtimes, user_ids, weights, deadline, results)
+        for n in range(args.customers)
+    ]
+
+    print(f"🚀 {args.customers} customers on {len(showtimes)} showtimes "
+          f"(pool max {args.pool_size}, {args.seat_distribution} seats, "
+          f"think {args.think_time:.2f}s)...")
+    pool_before = get_pool().stats()
+    # The other figures are differences of the snapshots; a maximum cannot be
+    get_pool().reset_wait_max()
+    started = time.perf_counter()
+    for customer in customers:
+        customer.start()
+    for customer in customers:
+        customer.join()
+    wall_time = time.perf_counter() - started
+    pool_after = get_pool().stats()
+
+    booking_latencies = sorted(r[1] for r in results if r[0] in ("booked", "conflict", "error"))
+    map_latencies = sorted(r[2] for r in results if r[0] != "map_error")
+    counts = {
+        k: sum(1 for r in results if r[0] == k)
+        for k in ("booked", "conflict", "sold_out", "error", "map_error")
+    }
+    attempts = counts["booked"] + counts["conflict"] + counts["error"]
+    waits = pool_after["waits"] - pool_before["waits"]
+    wait_total = pool_after["wait_time_total"] - pool_before["wait_time_total"]
+
+    report = {
+        "customers": args.customers,
+        "showtimes": len(showtimes),
+        "pool_size": args.pool_size,
+        "wall_time_s": round(wall_time, 3),
+        "attempts": attempts,
+        **counts,
+        "throughput_bookings_per_s": round(counts["booked"] / wall_time, 2) if wall_time else 0.0,
+        "conflict_rate": round(counts["conflict"] / attempts, 4) if attempts else 0.0,
+        "booking_latency_ms": {
+            f"p{p}": round(percentile(booking_latencies, p) * 1000, 2) for p in (50, 95, 99)
+        },
+        "seat_map_latency_ms": {
+            f"p{p}": round(percentile(map_latencies, p) * 1000, 2) for p in (50, 95, 99)
+        },
+        "pool_waits": waits,
+        "pool_wait_avg_ms": round(wait_total / waits * 1000, 2) if waits else 0.0,
+        "pool_wait_max_ms": round(pool_after["wait_time_max"] * 1000, 2),
+        "pool_timeouts": pool_after["timeouts"] - pool_before["timeouts"],
+    }
+
+    if not args.keep:
+        booking_ids = [r[3] for r in results if r[3] is not None]
+        if booking_ids:
+            with db_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("DELETE FROM bookings WHERE id = ANY(%s)", (booking_ids,))
+                conn.commit()
+            print(f"🧹 Removed {len(booking_ids)} test bookings.")
+
+    return report
+
+
+def print_report(report):
+    lat = report["booking_latency_ms"]
+    print(f"\n✅ {report['booked']} bookings in {report['wall_time_s']}s "
+          f"→ {report['throughput_bookings_per_s']} bookings/s")
+    print(f"   attempts {report['attempts']}, conflicts {report['conflict']} "
+          f"({report['conflict_rate']:.1%}), sold out {report['sold_out']}, errors {report['error']}, "
+          f"seat map errors {report['map_error']}")
+    print(f"   booking latency p50 {lat['p50']} ms, p95 {lat['p95']} ms, p99 {lat['p99']} ms")
+    lat = report["seat_map_latency_ms"]
+    print(f"   seat map latency p50 {lat['p50']} ms, p95 {lat['p95']} ms, p99 {lat['p99']} ms")
+    print(f"   pool waits {report['pool_waits']} (avg {report['pool_wait_avg_ms']} ms, "
+          f"max {report['pool_wait_max_ms']} ms), timeouts {report['pool_timeouts']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate concurrent customers booking seats.")
+    parser.add_argument("--customers", type=int, default=20, help="concurrent customers")
+    parser.add_argument("--bookings", type=int, default=20, help="booking attempts per customer")
+    parser.add_argument("--duration", type=float, default=60.0, help="stop after this many seconds")
+    parser.add_argument("--showtimes", type=int, default=5, help="upcoming showtimes to spread load over")
+    parser.add_argument("--showtime-ids", type=int, nargs="+", help="book these showtimes instead")
+    parser.add_argument("--hot-share", type=float, default=0.0,
+                        help="fraction of customers that all want the first showtime (0-1)")
+    parser.add_argument("--min-seats", type=int, default=1)
+    parser.add_argument("--max-seats", type=int, default=4)
+    parser.add_argument("--seat-distribution", choices=("uniform", "center", "back"), default="center")
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="mean seconds between seeing the seat map and booking")
+    parser.add_argument("--pool-size", type=int, default=settings.db.DB_POOL_MAX_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the bookings made by the test")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report = run_load_test(args)
+    if report is None:
+        sys.exit(1)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
@@ -8,6 +8,7 @@ sys.path.append(BASE_DIR)
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 from db.connection import get_db_connection
+from db.migrations import migrate
 
 
 def fix_database_schema():
@@ -16,26 +17,16 @@ def fix_database_schema():
     try:
         print("🛠️  Updating database schema...")
 
-        # 1. Create the showtimes table if it doesn't exist
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS showtimes (
-                id SERIAL PRIMARY KEY,
-                movie_id INTEGER REFERENCES movies(id) ON DELETE CASCADE,
-                room_id INTEGER, 
-                start_time TIMESTAMP,
-                end_time TIMESTAMP
-            );
-        """)
-
-        # 2. Add missing columns one by one just in case
-        cur.execute("ALTER TABLE showtimes ADD COLUMN IF NOT EXISTS room_id INTEGER;")
-        cur.execute("ALTER TABLE showtimes ADD COLUMN IF NOT EXISTS end_time TIMESTAMP;")
-
-        # 3. Clean up existing data for a fresh start
+        # 1. Bring the schema up to date (hall_id, end_time, ...)
+        applied = migrate(conn)
+        if applied:
+            print(f"   Applied migrations: {', '.join(map(str, applied))}")
+
+        # 2. Clean up existing data for a fresh start
         cur.execute("TRUNCATE TABLE movies, showtimes RESTART IDENTITY CASCADE;")
 
         conn.commit()
-        print("✅ Schema fixed! room_id and end_time are now ready.")
+        print("✅ Schema fixed! Movies and showtimes are empty and ready for import.")
 
     except Exception as e:
         print(f"❌ Error during schema update: {e}")
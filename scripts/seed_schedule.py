@@ -1,56 +1,162 @@
-import random
+import argparse
 import sys
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
 from dotenv import load_dotenv
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 load_dotenv(os.path.join(BASE_DIR, ".env"))
+from db.bulk import copy_rows
 from db.connection import get_db_connection
+from db.partitions import ensure_partitions
+from db.seat_map import SEAT_COUNT
+from services.hall_occupancy import HallOccupancyIndex
 
+OPENING_MINUTE = 10 * 60       # first show starts at 10:00
+LAST_START_MINUTE = 23 * 60    # no show starts after 23:00
+SLOT_ROUNDING = 5              # start times land on 5-minute marks
+DEFAULT_DURATION = 120         # for movies imported without a runtime
+DAYS_PER_MONTH = 30
 
-def seed_guaranteed_schedule():
+
+def build_schedule(movie_ids, durations, hall_ids, start_date, months=12,
+                   cleaning_gap=15, seed=42):
+    """Packs showtimes back-to-back into every hall, one 30-day month at a time.
+
+    Each hall-day is a row of slots filled from the opening time onwards:
+    a show starts once the previous one has ended and the hall has been
+    cleaned for `cleaning_gap` minutes, so shows in a hall never overlap.
+    Movies are dealt slot-major from shuffled decks, which gives every movie
+    at least one show per month whenever halls * 30 >= number of movies.
+
+    Everything is computed on NumPy arrays; the same seed always produces the
+    same schedule. Returns (movie_id, hall_id, start, end, price) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    movie_ids = np.asarray(movie_ids, dtype=np.int64)
+    durations = np.asarray(durations, dtype=np.int64)
+    hall_ids = np.asarray(hall_ids, dtype=np.int64)
+    n_movies, n_halls = len(movie_ids), len(hall_ids)
+
+    # Minutes a show occupies its hall, cleaning included, rounded up to the slot grid
+    blocks = -(-(durations + cleaning_gap) // SLOT_ROUNDING) * SLOT_ROUNDING
+    max_slots = int((LAST_START_MINUTE - OPENING_MINUTE) // blocks.min()) + 1
+
+    first_day = np.datetime64(start_date, "D")
+    chunks = []
+    for month in range(months):
+        cells = n_halls * DAYS_PER_MONTH * max_slots
+        decks = -(-cells // n_movies)
+        dealt = np.concatenate([rng.permutation(n_movies) for _ in range(decks)])[:cells]
+        # Slot-major deal: every hall-day gets its first show before any gets a second
+        picks = dealt.reshape(max_slots, n_halls, DAYS_PER_MONTH).transpose(1, 2, 0)
+
+        offsets = np.cumsum(blocks[picks], axis=2) - blocks[picks] + OPENING_MINUTE
+        valid = offsets <= LAST_START_MINUTE
+        hall_idx, day_idx, _ = np.nonzero(valid)
+        picked = picks[valid]
+
+        days = first_day + month * DAYS_PER_MONTH + day_idx
+        starts = days.astype("datetime64[m]") + offsets[valid]
+        ends = starts + durations[picked]
+        prices = np.round(rng.uniform(12.0, 22.0, size=len(picked)), 2)
+
+        chunks.append((movie_ids[picked], hall_ids[hall_idx], starts, ends, prices))
+
+    return tuple(np.concatenate(parts) for parts in zip(*chunks))
+
+
+def ensure_halls(cur, count):
+    cur.execute("SELECT id FROM halls ORDER BY id;")
+    hall_ids = [r[0] for r in cur.fetchall()]
+    for n in range(len(hall_ids) + 1, count + 1):
+        cur.execute(
+            "INSERT INTO halls (name, total_seats) VALUES (%s, %s) RETURNING id",
+            (f"Hall {n}", SEAT_COUNT),
+        )
+        hall_ids.append(cur.fetchone()[0])
+    return hall_ids
+
+
+def validate_schedule(cleaning_gap=15):
+    """Loads the stored showtimes into a HallOccupancyIndex and reports hall clashes."""
+    index = HallOccupancyIndex.from_database()
+    conflicts = index.conflicts(gap=timedelta(minutes=cleaning_gap))
+    if not conflicts:
+        print(f"✅ {len(index):,} showtimes checked, no hall has overlapping shows.")
+        return True
+    print(f"❌ {len(conflicts)} clashes (less than {cleaning_gap} min apart in one hall):")
+    for hall_id, earlier, later in conflicts[:20]:
+        print(f"   hall {hall_id}: showtime {earlier} and {later}")
+    return False
+
+
+def seed_guaranteed_schedule(months=12, halls=10, cleaning_gap=15, seed=42, start_date=None):
     conn = get_db_connection()
     cur = conn.cursor()
 
     print("🧹 Clearing old showtimes...")
     cur.execute("TRUNCATE TABLE showtimes RESTART IDENTITY CASCADE;")
 
-    cur.execute("SELECT id, duration FROM movies;")
+    cur.execute("SELECT id, duration FROM movies WHERE retired_at IS NULL ORDER BY id;")
     all_movies = cur.fetchall()
+    if not all_movies:
+        print("❌ No movies to schedule. Import the catalog first.")
+        conn.rollback()
+        cur.close()
+        conn.close()
+        return
 
-    start_date = datetime.now().date()
-    # Seed for 12 months
-    for month in range(12):
-        month_start = start_date + timedelta(days=month * 30)
-        print(f"📅 Seeding Month {month + 1}...")
-
-        # Shuffle movies so they appear on different days each month
-        random.shuffle(all_movies)
+    hall_ids = ensure_halls(cur, halls)
 
-        for i, (movie_id, duration) in enumerate(all_movies):
-            # Distribute movies across the 30 days of the month
-            day_offset = i % 30
-            show_date = month_start + timedelta(days=day_offset)
-            room_id = (i % 10) + 1
+    started = time.perf_counter()
+    movie_ids = [m[0] for m in all_movies]
+    durations = [m[1] or DEFAULT_DURATION for m in all_movies]
+    schedule = build_schedule(
+        movie_ids, durations, hall_ids, start_date or datetime.now().date(),
+        months=months, cleaning_gap=cleaning_gap, seed=seed,
+    )
+    built = time.perf_counter() - started
 
-            # Set a random start time between 10 AM and 8 PM
-            start_time = datetime.combine(show_date, datetime.min.time()) + \
-                         timedelta(hours=random.randint(10, 20))
-            end_time = start_time + timedelta(minutes=duration)
-            price = round(random.uniform(12.0, 22.0), 2)
-
-            cur.execute("""
-                INSERT INTO showtimes (movie_id, room_id, start_time, end_time, price)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (movie_id, room_id, start_time, end_time, price))
+    print(f"📅 Loading {len(schedule[0]):,} showtimes across {len(hall_ids)} halls...")
+    movie_col, hall_col, start_col, end_col, price_col = schedule
+    if len(start_col):
+        days = start_col.astype("datetime64[D]")
+        ensure_partitions(cur, str(days.min()), str(days.max()))
+    rows = zip(
+        movie_col.tolist(),
+        hall_col.tolist(),
+        np.datetime_as_string(start_col, unit="m").tolist(),
+        np.datetime_as_string(end_col, unit="m").tolist(),
+        price_col.tolist(),
+    )
+    count = copy_rows(cur, "showtimes", ("movie_id", "hall_id", "start_time", "end_time", "price"), rows)
 
     conn.commit()
     cur.close()
     conn.close()
-    print("✅ Success! Every movie now has at least one show per month for the next year.")
+    elapsed = time.perf_counter() - started
+    print(f"✅ Success! {count:,} non-overlapping showtimes for the next {months} months "
+          f"(built in {built:.2f}s, loaded in {elapsed - built:.2f}s).")
 
 
 if __name__ == "__main__":
-    seed_guaranteed_schedule()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a non-overlapping showtime schedule.")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--halls", type=int, default=10, help="minimum number of halls to schedule")
+    parser.add_argument("--gap", type=int, default=15, help="cleaning gap between shows, in minutes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", type=date.fromisoformat, help="first day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--validate", action="store_true",
+                        help="check the stored schedule for hall clashes afterwards")
+    parser.add_argument("--validate-only", action="store_true",
+                        help="only check the existing schedule, do not regenerate it")
+    args = parser.parse_args()
+
+    if not args.validate_only:
+        seed_guaranteed_schedule(args.months, args.halls, args.gap, args.seed, args.start)
+    if args.validate or args.validate_only:
+        sys.exit(0 if validate_schedule(args.gap) else 1)
@@ -0,0 +1,269 @@
+import argparse
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import settings
+from services.poster_store import (
+    TEMP_PREFIX, InvalidPoster, PosterStore, content_hash, decodes, url_key,
+)
+from services.poster_thumbnails import Thumbnailer
+
+LEGACY_NAME = re.compile(r"movie_(\d+)\.jpg")
+
+
+def remove(path, dry_run):
+    if not dry_run:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def clean_leftovers(store, dry_run):
+    """Removes interrupted writes: temporary files of the store and old *.part downloads."""
+    removed = 0
+    for directory in (store.root, store.links_dir, store.blobs_dir, store.thumbs_dir):
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and (
+                    entry.name.startswith(TEMP_PREFIX) or entry.name.endswith(".part")
+                ):
+                    remove(entry.path, dry_run)
+                    removed += 1
+    return removed
+
+
+def legacy_posters(store):
+    """{movie_id: path} for the movie_<id>.jpg files cached before the store existed."""
+    found = {}
+    with os.scandir(store.root) as it:
+        for entry in it:
+            match = LEGACY_NAME.fullmatch(entry.name)
+            if entry.is_file() and match:
+                found[int(match.group(1))] = entry.path
+    return found
+
+
+def check_blob(store, name):
+    """'ok', or why blobs/<name> is bad: its bytes must hash to its name and decode."""
+    with open(store.blob_path(name), "rb") as f:
+        data = f.read()
+    if content_hash(data) != name:
+        return "hash mismatch"
+    if not decodes(data):
+        return "undecodable"
+    return "ok"
+
+
+def check_link(store, key, good_blobs):
+    """(outcome, digest) for by_url/<key>; relinks copies and lost blobs when the bytes are good."""
+    path = store.path(key)
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = content_hash(data)
+    blob = store.blob_path(digest)
+    if digest in good_blobs and os.path.samefile(path, blob):
+        return "ok", digest
+    if not decodes(data):
+        return "undecodable", None
+    return "relinked", digest
+
+
+def verify(store, workers, dry_run):
+    stats = Counter()
+    stats["leftovers removed"] = clean_leftovers(store, dry_run)
+
+    blobs = [e.name for e in os.scandir(store.blobs_dir) if e.is_file()]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(lambda name: check_blob(store, name), blobs))
+    good_blobs = set()
+    for name, outcome in zip(blobs, outcomes):
+        stats[f"blob {outcome}"] += 1
+        if outcome == "ok":
+            good_blobs.add(name)
+        else:
+            remove(store.blob_path(name), dry_run)
+
+    keys = [e.name for e in os.scandir(store.links_dir) if e.is_file()]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda key: check_link(store, key, good_blobs), keys))
+    referenced = set()
+    for key, (outcome, digest) in zip(keys, results):
+        stats[f"poster {outcome}"] += 1
+        if outcome == "undecodable":
+            remove(store.path(key), dry_run)
+            continue
+        referenced.add(digest)
+        if outcome == "relinked" and not dry_run:
+            # Restores a lost blob, or turns a copy back into a link to the shared one
+            with open(store.path(key), "rb") as f:
+                store.store(key, f.read())
+
+    for name in good_blobs - referenced:
+        stats["unreferenced blobs removed"] += 1
+        remove(store.blob_path(name), dry_run)
+
+    stats.update(verify_thumbnails(store, dry_run))
+    return stats
+
+
+def verify_thumbnails(store, dry_run):
+    """Removes thumbnails of posters that are gone and renders the missing ones."""
+    stats = Counter()
+    with os.scandir(store.thumbs_dir) as it:
+        for entry in it:
+            if entry.is_file() and not store.contains(entry.name.split(".", 1)[0]):
+                stats["orphan thumbnails removed"] += 1
+                remove(entry.path, dry_run)
+
+    jobs = []
+    with os.scandir(store.links_dir) as it:
+        for entry in it:
+            if entry.is_file() and not entry.name.startswith(TEMP_PREFIX):
+                missing = store.missing_thumbnails(entry.name)
+                if missing:
+                    jobs.append((entry.path, missing))
+    stats["posters missing thumbnails"] = len(jobs)
+    if dry_run or not jobs or store.thumbnailer is None:
+        return stats
+    for result in store.thumbnailer.render_many(jobs):
+        stats["thumbnails failed" if isinstance(result, Exception) else "thumbnails rendered"] += 1
+    return stats
+
+
+def active_poster_links():
+    """{movie_id: poster_link} for active movies that have one, or None without a database."""
+    from db.connection import get_db_connection
+
+    conn = get_db_connection()
+    if conn is None:
+        print("❌ Database connection failed.")
+        return None
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, poster_link FROM movies "
+            "WHERE retired_at IS NULL AND poster_link IS NOT NULL AND poster_link <> ''"
+        )
+        return dict(cur.fetchall())
+    finally:
+        conn.close()
+
+
+def import_legacy(store, links, workers, dry_run):
+    """Files movie_<id>.jpg under its movie's current poster link, then removes it.
+
+    Only trust this while movie ids still match the ones the files were
+    cached under (no re-import since).
+    """
+    stats = Counter()
+    legacy = legacy_posters(store)
+
+    def move(item):
+        movie_id, path = item
+        url = links.get(movie_id)
+        if not url:
+            return "legacy without movie"
+        if dry_run:
+            return "legacy to import"
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            if not store.contains(url_key(url)):
+                store.store(url_key(url), data)
+        except InvalidPoster:
+            os.remove(path)
+            return "legacy undecodable"
+        except OSError as e:
+            # A full disk, say: the file stays for the next run
+            print(f"⚠️ Could not import {path}: {e}")
+            return "legacy import failed"
+        os.remove(path)
+        return "legacy imported"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats.update(pool.map(move, legacy.items()))
+    return stats
+
+
+def refetch_missing(store, links, workers, dry_run):
+    """Downloads the posters of active movies that are not in the store."""
+    stats = Counter()
+    missing = sorted({url for url in links.values() if not store.contains(url_key(url))})
+    stats["posters missing"] = len(missing)
+    if dry_run or not missing:
+        return stats
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def fetch(url):
+        try:
+            store.download(session, url)
+            return "fetched"
+        except (requests.RequestException, InvalidPoster):
+            return "fetch failed"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats.update(pool.map(fetch, missing))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify the poster store and repair what is broken: bad or unreferenced "
+                    "blobs, undecodable posters, lost links, interrupted writes and missing thumbnails."
+    )
+    parser.add_argument("--dir", default=settings.ui.poster_cache_dir, help="poster store directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--import-legacy", action="store_true",
+                        help="move movie_<id>.jpg files into the store under their movie's poster link")
+    parser.add_argument("--refetch", action="store_true",
+                        help="also download the posters of active movies that are missing")
+    parser.add_argument("--dry-run", action="store_true", help="report problems without changing anything")
+    args = parser.parse_args()
+
+    thumbnailer = Thumbnailer(args.workers)
+    store = PosterStore(args.dir, thumbnailer)
+    started = time.perf_counter()
+    links = None
+    if args.import_legacy or args.refetch:
+        links = active_poster_links()
+        if links is None:
+            return 1
+
+    stats = Counter()
+    if args.import_legacy:
+        print(f"📦 Importing legacy posters from {args.dir}...")
+        stats.update(import_legacy(store, links, args.workers, args.dry_run))
+
+    print(f"🔍 Verifying posters in {args.dir} with {args.workers} workers...")
+    stats.update(verify(store, args.workers, args.dry_run))
+
+    if args.refetch:
+        stats.update(refetch_missing(store, links, args.workers, args.dry_run))
+
+    thumbnailer.shutdown()
+    for name, count in sorted(stats.items()):
+        print(f"   {name}: {count}")
+    verb = "Checked" if args.dry_run else "Verified and repaired"
+    print(f"✅ {verb} in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import random
+
+from db.connection import db_connection
+
+
+class _Node:
+    __slots__ = ("key", "start", "end", "showtime_id", "priority", "left", "right", "max_end")
+
+    def __init__(self, start, end, showtime_id, priority):
+        self.key = (start, showtime_id)
+        self.start = start
+        self.end = end
+        self.showtime_id = showtime_id
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+
+def _refresh(node):
+    node.max_end = node.end
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+
+
+def _split(node, key, inclusive=False):
+    """Splits a treap into (keys < key, keys >= key), or (<=, >) when inclusive."""
+    if node is None:
+        return None, None
+    goes_left = node.key <= key if inclusive else node.key < key
+    if goes_left:
+        node.right, right = _split(node.right, key, inclusive)
+        _refresh(node)
+        return node, right
+    left, node.left = _split(node.left, key, inclusive)
+    _refresh(node)
+    return left, node
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _refresh(left)
+        return left
+    right.left = _merge(left, right.left)
+    _refresh(right)
+    return right
+
+
+def _collect(node, lo, hi, out):
+    """Appends every interval of the subtree that overlaps [lo, hi), in start order."""
+    if node is None or node.max_end <= lo:
+        return
+    _collect(node.left, lo, hi, out)
+    if node.start >= hi:
+        return  # everything to the right starts even later
+    if node.end > lo:
+        out.append((node.start, node.end, node.showtime_id))
+    _collect(node.right, lo, hi, out)
+
+
+def _walk(node, out):
+    if node is None:
+        return
+    _walk(node.left, out)
+    out.append((node.start, node.end, node.showtime_id))
+    _walk(node.right, out)
+
+
+class HallOccupancyIndex:
+    """In-memory interval index of showtimes per hall.
+
+    Each hall keeps its showtimes in a treap ordered by start time and
+    augmented with the latest end time of every subtree, so inserts, removals
+    and "what overlaps [start, end)" queries all run in O(log n + k). Times
+    are whatever the caller passes in (datetimes from psycopg2 when loaded
+    with from_database()); intervals are half-open, so back-to-back shows do
+    not overlap.
+    """
+
+    def __init__(self, seed=None):
+        self._roots = {}  # hall_id -> treap root
+        self._showtimes = {}  # showtime_id -> (hall_id, start, end)
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_database(cls, window_start=None, window_end=None, batch_size=10_000):
+        """Builds an index from the showtimes table, optionally limited to a time window."""
+        index = cls()
+        conditions = ["end_time IS NOT NULL", "hall_id IS NOT NULL"]
+        params = []
+        if window_start is not None:
+            conditions.append("end_time > %s")
+            params.append(window_start)
+        if window_end is not None:
+            conditions.append("start_time < %s")
+            params.append(window_end)
+
+        with db_connection() as conn:
+            # Named cursor: rows stream from the server in batches
+            with conn.cursor(name="hall_occupancy_load") as cur:
+                cur.itersize = batch_size
+                cur.execute(
+                    f"SELECT id, hall_id, start_time, end_time FROM showtimes "
+                    f"WHERE {' AND '.join(conditions)}",
+                    params,
+                )
+                for showtime_id, hall_id, start, end in cur:
+                    index.add(showtime_id, hall_id, start, end)
+            conn.rollback()
+        return index
+
+    def __len__(self):
+        return len(self._showtimes)
+
+    def __contains__(self, showtime_id):
+        return showtime_id in self._showtimes
+
+    @property
+    def hall_ids(self):
+        return list(self._roots)
+
+    def add(self, showtime_id, hall_id, start, end):
+        if showtime_id in self._showtimes:
+            self.remove(showtime_id)
+        if end <= start:
+            raise ValueError(f"Showtime {showtime_id} ends before it starts")
+
+        node = _Node(start, end, showtime_id, self._random.random())
+        left, right = _split(self._roots.get(hall_id), node.key)
+        self._roots[hall_id] = _merge(_merge(left, node), right)
+        self._showtimes[showtime_id] = (hall_id, start, end)
+
+    def remove(self, showtime_id):
+        entry = self._showtimes.pop(showtime_id, None)
+        if entry is None:
+            return False
+        hall_id, start, _ = entry
+        key = (start, showtime_id)
+        left, rest = _split(self._roots.get(hall_id), key)
+        _, right = _split(rest, key, inclusive=True)
+        root = _merge(left, right)
+        if root is None:
+            self._roots.pop(hall_id, None)
+        else:
+            self._roots[hall_id] = root
+        return True
+
+    def move(self, showtime_id, hall_id, start, end):
+        """Reschedules an existing showtime (or adds it if unknown)."""
+        self.add(showtime_id, hall_id, start, end)
+
+    def overlaps(self, hall_id, start, end, gap=None):
+        """Showtimes in the hall that overlap [start, end), widened by a cleaning gap.
+
+        Returns (start, end, showtime_id) tuples ordered by start.
+        """
+        if gap:
+            start, end = start - gap, end + gap
+        out = []
+        _collect(self._roots.get(hall_id), start, end, out)
+        return out
+
+    def is_free(self, hall_id, start, end, gap=None, ignore=None):
+        """True if nothing but `ignore` (a showtime being moved) occupies the slot."""
+        return all(sid == ignore for _, _, sid in self.overlaps(hall_id, start, end, gap))
+
+    def free_halls(self, start, end, gap=None, hall_ids=None):
+        """Halls with no showtime overlapping [start, end). Unknown halls count as free."""
+        candidates = self._roots.keys() if hall_ids is None else hall_ids
+        return [h for h in candidates if self.is_free(h, start, end, gap)]
+
+    def free_slots(self, hall_id, window_start, window_end, min_length=None,
+                   gap=None):
+        """Gaps of at least `min_length` in the hall within [window_start, window_end)."""
+        def long_enough(slot_start, slot_end):
+            if slot_end <= slot_start:
+                return False
+            return min_length is None or slot_end - slot_start >= min_length
+
+        slots = []
+        cursor = window_start
+        for show_start, show_end, _ in self.overlaps(hall_id, window_start, window_end, gap):
+            busy_from, busy_to = (show_start - gap, show_end + gap) if gap else (show_start, show_end)
+            if long_enough(cursor, busy_from):
+                slots.append((cursor, busy_from))
+            if busy_to > cursor:
+                cursor = busy_to
+        if long_enough(cursor, window_end):
+            slots.append((cursor, window_end))
+        return slots
+
+    def showtimes(self, hall_id):
+        out = []
+        _walk(self._roots.get(hall_id), out)
+        return out
+
+    def conflicts(self, gap=None):
+        """Showtimes that start within `gap` of an earlier show still running in their hall.
+
+        Each collision is reported once as (hall_id, earlier_id, later_id).
+
+        One in-order sweep per hall, so validating a full import is O(n).
+        """
+        found = []
+        for hall_id in self._roots:
+            latest_end, latest_id = None, None
+            for start, end, showtime_id in self.showtimes(hall_id):
+                if latest_end is not None and start < (latest_end + gap if gap else latest_end):
+                    found.append((hall_id, latest_id, showtime_id))
+                if latest_end is None or end > latest_end:
+                    latest_end, latest_id = end, showtime_id
+        return found
@@ -0,0 +1,171 @@
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+
+# Field weights: a title hit outranks a person hit, which outranks a genre hit
+TITLE, PEOPLE, GENRE = 3.0, 2.0, 1.5
+
+EXACT, PREFIX = 1.0, 0.75
+FUZZY = 0.5             # times the trigram similarity of the corrected word
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MIN_LENGTH = 3
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize(text):
+    """Casefolds and strips accents, so "Amélie" and "AMELIE" index the same."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return _WORD.findall(normalize(text))
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MovieSearchIndex:
+    """In-memory inverted index over the movie catalog for search-as-you-type.
+
+    Words from titles, genres, directors and stars map to the movies they
+    occur in. Every query word must match as a prefix of an indexed word; a
+    word with no prefix match falls back to the closest indexed words by
+    trigram similarity, so small typos still find something. Results are
+    ranked by how and where the words matched, then by catalog order.
+
+    A query that only extends the previous one ("godf" -> "godfa") is
+    matched against the previous results instead of the whole index, as
+    long as every word still has a prefix match. A word that falls back to
+    fuzzy matching searches the whole index, so results never depend on
+    what was typed before.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)  # word -> {movie_id: best field weight}
+        self._vocabulary = []               # sorted distinct words, for prefix ranges
+        self._word_trigrams = defaultdict(set)
+        self._order = {}                    # movie_id -> catalog position
+        self._titles = {}
+        self._last_terms = None
+        self._last_results = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds an index from MovieRepo.get_catalog() rows."""
+        index = cls()
+        for row in rows:
+            movie_id, title, genre = row[0], row[1], row[2]
+            director, stars = row[6], row[7]
+            index.add(movie_id, title, genre, director, stars)
+        index.finish()
+        return index
+
+    def __len__(self):
+        return len(self._order)
+
+    def add(self, movie_id, title, genre=None, director=None, stars=None):
+        """Indexes one movie. Call finish() after the last add()."""
+        self._order.setdefault(movie_id, len(self._order))
+        self._titles[movie_id] = normalize(title)
+        for text, weight in ((title, TITLE), (director, PEOPLE), (stars, PEOPLE), (genre, GENRE)):
+            for word in tokenize(text):
+                postings = self._postings[word]
+                if postings.get(movie_id, 0.0) < weight:
+                    postings[movie_id] = weight
+
+    def finish(self):
+        self._vocabulary = sorted(self._postings)
+        self._word_trigrams = defaultdict(set)
+        for word in self._vocabulary:
+            for gram in _trigrams(word):
+                self._word_trigrams[gram].add(word)
+        self._last_terms = self._last_results = None
+
+    def _prefix_words(self, term):
+        start = bisect.bisect_left(self._vocabulary, term)
+        words = []
+        for word in self._vocabulary[start:]:
+            if not word.startswith(term):
+                break
+            words.append(word)
+        return words
+
+    def _fuzzy_words(self, term):
+        """(word, similarity) for indexed words sharing enough trigrams with `term`."""
+        grams = _trigrams(term)
+        shared = defaultdict(int)
+        for gram in grams:
+            for word in self._word_trigrams.get(gram, ()):
+                shared[word] += 1
+        matches = []
+        for word, count in shared.items():
+            similarity = count / (len(grams) + len(_trigrams(word)) - count)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches.append((word, similarity))
+        return matches
+
+    def _match_term(self, term, candidates):
+        """{movie_id: score} for one query word, limited to `candidates` when given."""
+        matches = [(word, EXACT if word == term else PREFIX) for word in self._prefix_words(term)]
+        if not matches and len(term) >= FUZZY_MIN_LENGTH:
+            matches = [(word, FUZZY * similarity) for word, similarity in self._fuzzy_words(term)]
+
+        scores = {}
+        for word, quality in matches:
+            for movie_id, weight in self._postings[word].items():
+                if candidates is not None and movie_id not in candidates:
+                    continue
+                score = quality * weight
+                if score > scores.get(movie_id, 0.0):
+                    scores[movie_id] = score
+        return scores
+
+    def _refines_last(self, terms):
+        last = self._last_terms
+        if not last or not self._last_results or len(terms) < len(last):
+            return False
+        if terms[:len(last) - 1] != last[:-1] or not terms[len(last) - 1].startswith(last[-1]):
+            return False
+        # Prefix matches only narrow as words grow; fuzzy ones do not
+        return all(self._prefix_words(term) for term in terms)
+
+    def search(self, query, limit=None):
+        """Returns the ids of the movies matching `query`, best first.
+
+        An empty query returns the whole catalog in its original order.
+        """
+        terms = tokenize(query)
+        if not terms:
+            self._last_terms = self._last_results = None
+            results = sorted(self._order, key=self._order.get)
+            return results[:limit] if limit else results
+
+        candidates = self._last_results if self._refines_last(terms) else None
+        scores = None
+        for term in terms:
+            term_scores = self._match_term(term, candidates)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {mid: scores[mid] + s for mid, s in term_scores.items() if mid in scores}
+            if not scores:
+                break
+            candidates = scores.keys()
+
+        phrase = " ".join(terms)
+        results = sorted(
+            scores,
+            key=lambda mid: (
+                not self._titles[mid].startswith(phrase),
+                -scores[mid],
+                self._order[mid],
+            ),
+        )
+        self._last_terms = terms
+        self._last_results = set(results)
+        return results[:limit] if limit else results
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+
+from PySide6.QtCore import QByteArray
+from PySide6.QtGui import QImage
+
+from services.poster_thumbnails import TEMP_PREFIX, THUMBNAIL_SUFFIX, VARIANTS
+
+DOWNLOAD_TIMEOUT = 5
+CHUNK_SIZE = 64 * 1024
+MAX_POSTER_BYTES = 20 * 1024 * 1024
+# Servers that do not label their images properly; the decode check still applies
+UNTYPED_CONTENT = ("", "application/octet-stream", "binary/octet-stream")
+
+
+class InvalidPoster(Exception):
+    pass
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def url_key(url):
+    """Cache key of a poster: the SHA-256 of its source URL."""
+    return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def decodes(data):
+    return not QImage.fromData(QByteArray(data)).isNull()
+
+
+class PosterStore:
+    """Poster files addressed by what they are rather than by movie id.
+
+    Every distinct image is stored once under blobs/<sha256 of its bytes>.
+    by_url/<sha256 of its URL> is a hard link to the blob (a copy where the
+    filesystem has no hard links), so looking a poster up by URL is a single
+    path and catalogs that reuse an image share its bytes. Files appear
+    atomically: they are written under a temporary name in the same directory
+    and renamed into place, and only after they decoded as an image.
+
+    With a Thumbnailer, storing a poster also renders its display VARIANTS
+    into thumbs/<key>.<variant>.jpg, so views never resample at runtime.
+    """
+
+    def __init__(self, root, thumbnailer=None):
+        self.root = root
+        self.thumbnailer = thumbnailer
+        self.links_dir = os.path.join(root, "by_url")
+        self.blobs_dir = os.path.join(root, "blobs")
+        self.thumbs_dir = os.path.join(root, "thumbs")
+        for directory in (self.links_dir, self.blobs_dir, self.thumbs_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.links_dir, key)
+
+    def thumbnail_path(self, key, variant):
+        return os.path.join(self.thumbs_dir, f"{key}.{variant}{THUMBNAIL_SUFFIX}")
+
+    def missing_thumbnails(self, key):
+        """{variant: path} of the variants of `key` not rendered yet."""
+        targets = {variant: self.thumbnail_path(key, variant) for variant in VARIANTS}
+        return {v: p for v, p in targets.items() if not os.path.exists(p)}
+
+    def make_thumbnails(self, key):
+        """Renders the missing variants of `key`; a poster Pillow cannot read just keeps none."""
+        targets = self.missing_thumbnails(key)
+        if not targets or self.thumbnailer is None:
+            return
+        try:
+            self.thumbnailer.render(self.path(key), targets)
+        except Exception as e:
+            print(f"⚠️ Could not render thumbnails for poster {key}: {e}")
+
+    def blob_path(self, digest):
+        return os.path.join(self.blobs_dir, digest)
+
+    def contains(self, key):
+        return os.path.exists(self.path(key))
+
+    def _write_atomic(self, directory, name, data):
+        fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _link_atomic(self, blob, key):
+        tmp_path = os.path.join(self.links_dir, f"{TEMP_PREFIX}{uuid.uuid4().hex}")
+        try:
+            try:
+                os.link(blob, tmp_path)
+            except OSError:
+                shutil.copyfile(blob, tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def store(self, key, data):
+        """Validates `data` as an image and files it under `key`. Returns the path."""
+        if not data or not decodes(data):
+            raise InvalidPoster(f"poster {key} is not a decodable image")
+        digest = content_hash(data)
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            self._write_atomic(self.blobs_dir, digest, data)
+        self._link_atomic(blob, key)
+        # A re-stored key may have new content, so its old variants go
+        self._remove_thumbnails(key)
+        self.make_thumbnails(key)
+        return self.path(key)
+
+    def _remove_thumbnails(self, key):
+        for variant in VARIANTS:
+            try:
+                os.remove(self.thumbnail_path(key, variant))
+            except FileNotFoundError:
+                pass
+
+    def size(self, key):
+        """Bytes used by `key`: the poster and its rendered variants."""
+        total = 0
+        for path in [self.path(key), *(self.thumbnail_path(key, v) for v in VARIANTS)]:
+            try:
+                total += os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+        return total
+
+    def remove(self, key):
+        """Deletes the poster for `key` with its variants, and its blob once nothing else links to it."""
+        self._remove_thumbnails(key)
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                digest = content_hash(f.read())
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        blob = self.blob_path(digest)
+        try:
+            if os.stat(blob).st_nlink <= 1:
+                os.remove(blob)
+        except FileNotFoundError:
+            pass
+
+    def download(self, session, url, is_cancelled=lambda: False):
+        """Fetches `url` and stores it under url_key(url), giving up between chunks once is_cancelled().
+
+        Error statuses, non-image content types, oversized bodies and bytes
+        that do not decode are rejected with an exception and leave nothing
+        behind.
+        """
+        with session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as res:
+            res.raise_for_status()
+            content_type = res.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if not content_type.startswith("image/") and content_type not in UNTYPED_CONTENT:
+                raise InvalidPoster(f"{url} returned {content_type}, not an image")
+            chunks = []
+            size = 0
+            for chunk in res.iter_content(CHUNK_SIZE):
+                if is_cancelled():
+                    raise DownloadCancelled(url)
+                size += len(chunk)
+                if size > MAX_POSTER_BYTES:
+                    raise InvalidPoster(f"{url} is larger than {MAX_POSTER_BYTES} bytes")
+                chunks.append(chunk)
+        return self.store(url_key(url), b"".join(chunks))
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+# Display variants rendered once per poster. "contain" fits the whole poster
+# inside the box (grid cards), "cover" fills the box and crops the overflow
+# (ShowtimeView).
+CARD, DETAIL = "card", "detail"
+VARIANTS = {
+    CARD: (180, 260, "contain"),
+    DETAIL: (320, 460, "cover"),
+}
+# Progressive JPEG rather than WebP: every Qt build decodes it without the
+# optional imageformats plugins, and at these sizes the files are a few KB.
+THUMBNAIL_FORMAT = "JPEG"
+THUMBNAIL_SUFFIX = ".jpg"
+JPEG_QUALITY = 85
+THUMBNAIL_WORKERS = 2
+TEMP_PREFIX = ".tmp-"
+
+
+def _save_atomic(image, path):
+    fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, THUMBNAIL_FORMAT, quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def render_thumbnails(source_path, targets):
+    """Writes each {variant: path} in `targets` from the image at `source_path`.
+
+    Runs in a worker process, so it only touches Pillow. JPEG sources are
+    decoded in draft mode, straight at the smallest scale that still covers
+    the largest variant.
+    """
+    largest = (
+        max(VARIANTS[v][0] for v in targets),
+        max(VARIANTS[v][1] for v in targets),
+    )
+    with Image.open(source_path) as image:
+        image.draft("RGB", largest)
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for variant, path in targets.items():
+            width, height, fit = VARIANTS[variant]
+            if fit == "cover":
+                thumb = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+            else:
+                thumb = ImageOps.contain(image, (width, height), Image.Resampling.LANCZOS)
+            _save_atomic(thumb, path)
+    return list(targets)
+
+
+class Thumbnailer:
+    """Renders poster variants in a small pool of worker processes.
+
+    render() blocks the calling thread until the variants are written, and
+    is meant to be called from download threads, never the GUI thread. The
+    pool starts on first use, usually from one of those threads, so its
+    workers are spawned rather than forked: forking a process that is
+    running other threads can copy a lock some thread was holding.
+    """
+
+    def __init__(self, workers=THUMBNAIL_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def render(self, source_path, targets):
+        return self._get_pool().submit(render_thumbnails, source_path, targets).result()
+
+    def render_many(self, jobs):
+        """Renders [(source_path, targets), ...] in parallel; yields each job's result or exception."""
+        pool = self._get_pool()
+        futures = [pool.submit(render_thumbnails, source, targets) for source, targets in jobs]
+        for future in futures:
+            try:
+                yield future.result()
+            except Exception as e:
+                yield e
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
@@ -0,0 +1,59 @@
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Tests import the app packages (config, db, ...) from the project root
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+
+class _Routes(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        status, content_type, body = self.server.routes.get(self.path, (404, "text/plain", b"not found"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """A local HTTP stand-in: set server.routes[path] = (status, content type, body).
+
+    server.url(path) gives the full URL and server.hits counts the requests per path.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Routes)
+    server.routes = {}
+    server.hits = {}
+    server.url = lambda path: f"http://127.0.0.1:{server.server_port}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_png():
+    """make_png(color="red") returns the bytes of a small PNG image (needs PySide6)."""
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+    from PySide6.QtGui import QColor, QImage
+
+    def make(color="red", size=4):
+        image = QImage(size, size, QImage.Format_RGB32)
+        image.fill(QColor(color))
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        return bytes(data)
+
+    return make
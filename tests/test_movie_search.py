@@ -0,0 +1,132 @@
+import csv
+import os
+
+import pytest
+
+from services.movie_search import MovieSearchIndex, normalize, tokenize
+
+CATALOG_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "data", "imdb_top_1000.csv")
+
+
+def make_index(*movies):
+    """Index of (title, genre, director, stars) tuples, ids 1, 2, ... in catalog order."""
+    index = MovieSearchIndex()
+    for movie_id, movie in enumerate(movies, start=1):
+        index.add(movie_id, *movie)
+    index.finish()
+    return index
+
+
+@pytest.fixture(scope="module")
+def catalog_index():
+    index = MovieSearchIndex()
+    with open(CATALOG_CSV, encoding="utf-8", newline="") as f:
+        for movie_id, row in enumerate(csv.DictReader(f), start=1):
+            stars = ", ".join(row[f"Star{i}"] for i in range(1, 5))
+            index.add(movie_id, row["Series_Title"], row["Genre"], row["Director"], stars)
+    index.finish()
+    return index
+
+
+def typed(index, query):
+    """Searches `query` the way search-as-you-type does: one keystroke at a time."""
+    index.search("")
+    for end in range(1, len(query)):
+        index.search(query[:end])
+    return index.search(query)
+
+
+def searched_directly(index, query):
+    index.search("")
+    return index.search(query)
+
+
+def test_normalize_folds_case_and_accents():
+    assert normalize("Amélie") == normalize("AMELIE") == "amelie"
+    assert tokenize("Léon: The Professional") == ["leon", "the", "professional"]
+
+
+def test_accented_titles_match_plain_queries():
+    index = make_index(("Amélie", "Romance", None, None), ("Léon", "Crime", None, None))
+    assert index.search("amelie") == [1]
+    assert index.search("LEON") == [2]
+    assert index.search("amél") == [1]
+
+
+def test_every_word_must_match():
+    index = make_index(
+        ("The Dark Knight", "Action", "Christopher Nolan", "Christian Bale"),
+        ("Dark City", "Sci-Fi", "Alex Proyas", "Rufus Sewell"),
+    )
+    assert set(index.search("dark")) == {1, 2}
+    assert index.search("dark nolan") == [1]
+    assert index.search("dark nolan sewell") == []
+
+
+def test_exact_word_outranks_prefix():
+    index = make_index(("Godfathers", None, None, None), ("Godfather", None, None, None))
+    assert index.search("godfather") == [2, 1]
+
+
+def test_title_outranks_people_and_genre():
+    index = make_index(
+        ("Drama Club", None, None, None),
+        ("Quiet Days", "Drama", None, None),
+        ("Loud Nights", None, "Anna Drama", None),
+    )
+    assert index.search("drama") == [1, 3, 2]
+
+
+def test_title_starting_with_the_query_comes_first():
+    index = make_index(("The Great Escape", None, None, None), ("Great Expectations", None, None, None))
+    assert index.search("great") == [2, 1]
+
+
+def test_ties_keep_catalog_order():
+    index = make_index(*[(f"Heat {n}", None, None, None) for n in range(5)])
+    assert index.search("heat") == [1, 2, 3, 4, 5]
+
+
+def test_empty_query_returns_the_catalog_in_order():
+    index = make_index(("B", None, None, None), ("A", None, None, None))
+    assert index.search("  ") == [1, 2]
+    assert index.search("", limit=1) == [1]
+
+
+def test_typo_falls_back_to_fuzzy_match():
+    index = make_index(("The Godfather", "Crime", None, None), ("Casablanca", "Drama", None, None))
+    assert index.search("godfathr") == [1]
+
+
+def test_prefix_match_suppresses_fuzzy_match():
+    index = make_index(("Godfather", None, None, None), ("Godzilla", None, None, None))
+    assert index.search("godz") == [2]
+
+
+def test_short_words_are_not_fuzzy_matched():
+    index = make_index(("Up", None, None, None),)
+    assert index.search("xp") == []
+
+
+def test_refined_query_matches_search_from_scratch():
+    index = make_index(
+        ("How to Train Your Dragon", "Animation", None, None),
+        ("Drama Queen", "Drama", None, None),
+        ("Dragnet", "Crime", None, None),
+    )
+    for query in ("dragon", "dranon", "drma", "dragnot", "drama queen", "dragon anim"):
+        assert typed(index, query) == searched_directly(index, query), query
+
+
+def test_typo_typed_letter_by_letter_matches_direct_search(catalog_index):
+    # Narrowing to the previous results used to drop fuzzy matches:
+    # "dranon" typed letter by letter found nothing, searched directly 4 movies
+    direct = searched_directly(catalog_index, "dranon")
+    assert len(direct) == 4
+    assert typed(catalog_index, "dranon") == direct
+
+
+@pytest.mark.parametrize("query", ["godfathr", "shawshenk", "nolan dark", "star wras", "leon profesional"])
+def test_catalog_queries_do_not_depend_on_typing_history(catalog_index, query):
+    assert typed(catalog_index, query) == searched_directly(catalog_index, query)
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("PIL")
+requests = pytest.importorskip("requests")
+
+from PySide6.QtCore import QCoreApplication
+
+from services.poster_store import PosterStore, url_key
+from ui.poster_loader import PosterLoader
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def loader(qapp, tmp_path):
+    store = PosterStore(str(tmp_path))
+    loader = PosterLoader(store.download, max_workers=2, session=requests.Session())
+    loader.loaded, loader.failed = [], []
+    loader.posterLoaded.connect(lambda key, path: loader.loaded.append((key, path)))
+    loader.posterFailed.connect(lambda key, error: loader.failed.append(key))
+    yield loader
+    loader.cancel_all()
+    loader.pool.waitForDone()
+
+
+def wait_until(condition, timeout=5.0):
+    """Runs the Qt event loop, which delivers the loader's signals, until `condition()` holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the poster loader")
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+
+def test_loaded_poster_is_reported_with_its_stored_path(loader, http_server, make_png):
+    http_server.routes["/1.png"] = (200, "image/png", make_png())
+    url = http_server.url("/1.png")
+
+    loader.request(1, url)
+    wait_until(lambda: loader.loaded)
+
+    key, path = loader.loaded[0]
+    assert key == 1
+    assert path.endswith(url_key(url))
+    assert loader.failed == []
+
+
+def test_failed_poster_is_reported_and_not_fetched_again(loader, http_server):
+    url = http_server.url("/missing.png")
+
+    loader.request(1, url)
+    wait_until(lambda: loader.failed)
+    assert loader.has_failed(1)
+
+    loader.request(1, url)
+    QCoreApplication.processEvents()
+    loader.pool.waitForDone()
+    assert http_server.hits["/missing.png"] == 1
+
+    loader.reset_failures()
+    assert not loader.has_failed(1)
+
+
+def test_many_posters_all_arrive_through_a_small_pool(loader, http_server, make_png):
+    for n in range(10):
+        http_server.routes[f"/{n}.png"] = (200, "image/png", make_png())
+        loader.request(n, http_server.url(f"/{n}.png"))
+
+    wait_until(lambda: len(loader.loaded) == 10)
+    assert sorted(key for key, _ in loader.loaded) == list(range(10))
+
+
+def test_retain_drops_queued_requests(loader, http_server, make_png):
+    for n in range(10):
+        http_server.routes[f"/{n}.png"] = (200, "image/png", make_png())
+    # The first max_workers downloads start at once, the rest wait in the queue
+    for n in range(10):
+        loader.request(n, http_server.url(f"/{n}.png"))
+    loader.retain([0, 1])
+
+    wait_until(lambda: not loader._active and not loader._pending)
+    assert {key for key, _ in loader.loaded} <= {0, 1}
+    assert sum(http_server.hits.values()) <= loader.max_workers
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("PIL")
+requests = pytest.importorskip("requests")
+
+from services.poster_store import (
+    DownloadCancelled, InvalidPoster, PosterStore, content_hash, url_key,
+)
+
+
+def files(directory):
+    return sorted(os.listdir(directory))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PosterStore(str(tmp_path))
+
+
+def test_store_files_the_poster_under_its_key_and_content_hash(store, make_png):
+    data = make_png()
+    path = store.store("key", data)
+
+    assert path == store.path("key")
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert files(store.blobs_dir) == [content_hash(data)]
+    assert store.contains("key")
+
+
+def test_same_image_under_two_urls_is_stored_once(store, make_png):
+    data = make_png()
+    store.store(url_key("http://a/poster.jpg"), data)
+    store.store(url_key("http://b/poster.jpg"), data)
+
+    assert files(store.blobs_dir) == [content_hash(data)]
+    assert len(files(store.links_dir)) == 2
+
+
+def test_undecodable_bytes_are_rejected_and_leave_nothing_behind(store):
+    with pytest.raises(InvalidPoster):
+        store.store("key", b"<html>not an image</html>")
+    with pytest.raises(InvalidPoster):
+        store.store("key", b"")
+
+    assert not store.contains("key")
+    assert files(store.blobs_dir) == files(store.links_dir) == []
+
+
+def test_storing_a_key_again_replaces_its_content(store, make_png):
+    store.store("key", make_png("red"))
+    new = make_png("blue")
+    store.store("key", new)
+
+    with open(store.path("key"), "rb") as f:
+        assert f.read() == new
+    assert content_hash(new) in files(store.blobs_dir)
+    assert not [name for name in files(store.links_dir) if name.startswith(".tmp-")]
+
+
+def test_remove_keeps_a_blob_until_its_last_link_is_gone(store, make_png):
+    data = make_png()
+    store.store("a", data)
+    store.store("b", data)
+
+    store.remove("a")
+    assert not store.contains("a")
+    if os.stat(store.path("b")).st_nlink > 1:
+        # Only hard-linked blobs know how many posters share them
+        assert files(store.blobs_dir) == [content_hash(data)]
+
+    store.remove("b")
+    assert files(store.blobs_dir) == files(store.links_dir) == []
+
+
+def test_download_stores_the_image_under_its_url_key(store, http_server, make_png):
+    data = make_png()
+    http_server.routes["/poster.png"] = (200, "image/png", data)
+    url = http_server.url("/poster.png")
+
+    path = store.download(requests.Session(), url)
+
+    assert path == store.path(url_key(url))
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+
+@pytest.mark.parametrize("route, error", [
+    ((404, "text/plain", b"not found"), requests.HTTPError),
+    ((200, "text/html", b"<html></html>"), InvalidPoster),
+    ((200, "image/png", b"truncated"), InvalidPoster),
+    ((200, "application/octet-stream", b"not an image either"), InvalidPoster),
+])
+def test_download_rejects_what_is_not_a_poster(store, http_server, route, error):
+    http_server.routes["/poster"] = route
+    url = http_server.url("/poster")
+
+    with pytest.raises(error):
+        store.download(requests.Session(), url)
+    assert not store.contains(url_key(url))
+
+
+def test_cancelled_download_stores_nothing(store, http_server, make_png):
+    http_server.routes["/poster.png"] = (200, "image/png", make_png())
+    url = http_server.url("/poster.png")
+
+    with pytest.raises(DownloadCancelled):
+        store.download(requests.Session(), url, is_cancelled=lambda: True)
+    assert not store.contains(url_key(url))
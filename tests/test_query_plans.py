@@ -0,0 +1,106 @@
+"""EXPLAINs the hot queries against the configured database.
+
+Fails when one of them falls back to a sequential scan or a ShowtimeView
+lookup is not pruned to one monthly partition. Skipped when no database is
+configured (no DB_* settings in the environment or .env).
+"""
+import os
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("dotenv").load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+from pydantic import ValidationError
+
+try:
+    from config import settings  # noqa: F401  (validates the DB_* settings)
+except ValidationError:
+    pytest.skip("no database configured", allow_module_level=True)
+
+from db.connection import get_db_connection
+from db.indexes import create_indexes
+from db.movie_repo import CARDS_BY_ID_SQL, CATALOG_IDS_SQL, SEARCH_IDS_SQL, search_params
+from db.showtime_repo import (
+    SEAT_MAP_PRUNED_SQL, SEAT_MAP_SQL, SHOW_DATES_SQL, SHOWTIMES_SQL,
+    TAKEN_SEATS_PRUNED_SQL, TAKEN_SEATS_SQL,
+)
+
+# Hot queries with representative parameters. EXPLAIN does not need matching
+# rows, so the values only have to be well-typed.
+HOT_QUERIES = {
+    "show dates": (SHOW_DATES_SQL, (1,)),
+    "showtimes of a day": (SHOWTIMES_SQL, (1, "2026-01-14", "2026-01-14")),
+    "taken seats": (TAKEN_SEATS_SQL, (1,)),
+    "seat map": (SEAT_MAP_SQL, (1,)),
+    "catalog ids": (CATALOG_IDS_SQL, None),
+    "movie search ids": (SEARCH_IDS_SQL, {**search_params("godfathr"), "limit": None}),
+    "grid cards by id": (CARDS_BY_ID_SQL, (list(range(1, 101)),)),
+    "user login": (
+        "SELECT id, username, password_hash, role, first_name, last_name FROM users WHERE username = %s",
+        ("admin",),
+    ),
+}
+
+# ShowtimeView lookups that must be pruned to a single monthly partition
+PRUNED_QUERIES = {
+    "showtimes of a day": (SHOWTIMES_SQL, (1, "2026-01-14", "2026-01-14")),
+    "taken seats of a show": (TAKEN_SEATS_PRUNED_SQL, (1, "2026-01-14 18:00")),
+    "seat map of a show": (SEAT_MAP_PRUNED_SQL, (1, "2026-01-14 18:00")),
+}
+
+
+def find_seq_scans(plan):
+    """Returns the relations scanned sequentially anywhere in an EXPLAIN plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+def find_scanned_relations(plan):
+    """Returns every relation scanned anywhere in an EXPLAIN plan tree."""
+    found = [plan["Relation Name"]] if "Relation Name" in plan else []
+    for child in plan.get("Plans", []):
+        found.extend(find_scanned_relations(child))
+    return found
+
+
+@pytest.fixture(scope="module")
+def cursor():
+    conn = get_db_connection()
+    if conn is None:
+        pytest.fail("could not connect to the configured database")
+    try:
+        cur = conn.cursor()
+        create_indexes(cur)
+        # A seeded dev database is small enough that the planner would
+        # rightly prefer seq scans; disabling them leaves a Seq Scan in the
+        # plan only when no usable index exists.
+        cur.execute("SET LOCAL enable_seqscan = off")
+        yield cur
+    finally:
+        # Never keep the indexes created above outside of init_db
+        conn.rollback()
+        conn.close()
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    return cursor.fetchone()[0][0]["Plan"]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_is_index_backed(cursor, name):
+    seq_scans = find_seq_scans(explain(cursor, *HOT_QUERIES[name]))
+    assert not seq_scans, f"{name}: sequential scan on {', '.join(seq_scans)}"
+
+
+@pytest.mark.parametrize("name", PRUNED_QUERIES)
+def test_showtime_lookup_is_pruned(cursor, name):
+    relations = sorted(set(find_scanned_relations(explain(cursor, *PRUNED_QUERIES[name]))))
+    assert len(relations) <= 1, f"{name}: not pruned, scans {', '.join(relations)}"
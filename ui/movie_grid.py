@@ -0,0 +1,273 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import (
+    QAbstractListModel, QEvent, QModelIndex, QRect, QRectF, QSize, Qt, Signal,
+)
+from PySide6.QtGui import QBrush, QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+CARD_WIDTH, CARD_HEIGHT = 200, 420
+CARD_SPACING = 25
+POSTER_WIDTH, POSTER_HEIGHT = 180, 260
+ELIDE_CACHE_SIZE = 2000
+
+MovieIdRole = Qt.UserRole + 1
+RowRole = Qt.UserRole + 2     # grid-card row tuple, None while it is being loaded
+PosterRole = Qt.UserRole + 3  # scaled QPixmap, None while loading, NO_POSTER if there is none
+
+NO_POSTER = object()
+
+
+class MovieListModel(QAbstractListModel):
+    """Ordered list of movie ids whose card rows are loaded on demand.
+
+    The model only stores ids up front. Rows are asked for in blocks through
+    rowsRequested(block, ids) the first time the view paints one of them,
+    and handed back with add_rows(). At most MAX_CACHED_ROWS loaded rows are
+    kept, least recently painted first out, so memory stays flat however
+    far the user scrolls. Rows passed in with set_ids(rows_by_id=...) are
+    never evicted.
+    """
+
+    BLOCK_SIZE = 100
+    MAX_CACHED_ROWS = 2000
+
+    rowsRequested = Signal(int, list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = []
+        self._positions = {}
+        self._fixed_rows = {}
+        self._rows = OrderedDict()
+        self._requested = set()
+        # callable(movie_id, poster_url) -> QPixmap or None
+        self.poster_provider = None
+
+    def set_ids(self, ids, rows_by_id=None):
+        self.beginResetModel()
+        self._ids = list(ids)
+        self._positions = {movie_id: i for i, movie_id in enumerate(self._ids)}
+        self._fixed_rows = rows_by_id or {}
+        self._requested.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def _row(self, position):
+        movie_id = self._ids[position]
+        row = self._fixed_rows.get(movie_id)
+        if row is not None:
+            return row
+        row = self._rows.get(movie_id)
+        if row is None:
+            self._request_block(position // self.BLOCK_SIZE)
+        else:
+            self._rows.move_to_end(movie_id)
+        return row
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._ids):
+            return None
+        if role == MovieIdRole:
+            return self._ids[index.row()]
+
+        row = self._row(index.row())
+        if role == RowRole:
+            return row
+        if row is None:
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return row[1]
+        if role == PosterRole and self.poster_provider is not None:
+            return self.poster_provider(row[0], row[5])
+        return None
+
+    def _request_block(self, block):
+        if block in self._requested:
+            return
+        self._requested.add(block)
+        ids = self._ids[block * self.BLOCK_SIZE:(block + 1) * self.BLOCK_SIZE]
+        self.rowsRequested.emit(block, [i for i in ids if i not in self._rows])
+
+    def add_rows(self, block, rows):
+        """Stores rows loaded for `block` and repaints the cards showing them."""
+        self._requested.discard(block)
+        changed = []
+        for row in rows:
+            self._rows[row[0]] = row
+            self._rows.move_to_end(row[0])
+            if row[0] in self._positions:
+                changed.append(self._positions[row[0]])
+        while len(self._rows) > self.MAX_CACHED_ROWS:
+            self._rows.popitem(last=False)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed)), self.index(max(changed)))
+
+    def block_failed(self, block):
+        """Lets a block whose load failed be requested again on the next paint."""
+        self._requested.discard(block)
+
+    def ids_between(self, first, last):
+        return self._ids[first:last]
+
+    def poster_ready(self, movie_id):
+        position = self._positions.get(movie_id)
+        if position is not None:
+            index = self.index(position)
+            self.dataChanged.emit(index, index, [PosterRole])
+
+
+def _font(pixel_size, bold=False):
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    font.setBold(bold)
+    return font
+
+
+class MovieCardDelegate(QStyledItemDelegate):
+    """Paints a movie card (poster, title, genre, description, Book Now) straight onto the view."""
+
+    bookRequested = Signal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = _font(14, bold=True)
+        self.genre_font = _font(11)
+        self.desc_font = _font(11)
+        self.button_font = _font(12, bold=True)
+        self.placeholder_font = _font(12)
+        self.desc_metrics = QFontMetrics(self.desc_font)
+        self._elided = {}  # movie_id -> elided description
+
+    def elided_description(self, movie_id, description):
+        text = self._elided.get(movie_id)
+        if text is None:
+            if len(self._elided) >= ELIDE_CACHE_SIZE:
+                self._elided.clear()
+            text = self.desc_metrics.elidedText(
+                description or "No description available.", Qt.ElideRight, POSTER_WIDTH * 2
+            )
+            self._elided[movie_id] = text
+        return text
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    @staticmethod
+    def _card_rect(option):
+        # The view's grid cell includes the spacing; the card is centered in it
+        return QRect(
+            option.rect.x() + (option.rect.width() - CARD_WIDTH) // 2,
+            option.rect.y() + (option.rect.height() - CARD_HEIGHT) // 2,
+            CARD_WIDTH,
+            CARD_HEIGHT,
+        )
+
+    def button_rect(self, option):
+        card = self._card_rect(option)
+        return QRect(card.x() + 10, card.bottom() - 15 - 30, CARD_WIDTH - 20, 30)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        card = self._card_rect(option)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.setPen(QPen(QColor("#ffb400") if hovered else QColor(255, 255, 255, 25), 1))
+        painter.setBrush(QColor(50, 50, 50, 230) if hovered else QColor(30, 30, 30, 178))
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+
+        poster_rect = QRect(card.x() + 10, card.y() + 10, POSTER_WIDTH, POSTER_HEIGHT)
+        row = index.data(RowRole)
+        poster = index.data(PosterRole) if row is not None else None
+        if poster is not None and poster is not NO_POSTER and not poster.isNull():
+            target = QRect(0, 0, poster.width(), poster.height())
+            target.moveCenter(poster_rect.center())
+            path = QPainterPath()
+            path.addRoundedRect(QRectF(poster_rect), 8, 8)
+            painter.save()
+            painter.setClipPath(path)
+            painter.drawPixmap(target, poster)
+            painter.restore()
+        else:
+            painter.setPen(QPen(QColor("#555"), 1, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(QRectF(poster_rect), 8, 8)
+            painter.setPen(QColor("#777"))
+            painter.setFont(self.placeholder_font)
+            painter.drawText(poster_rect, Qt.AlignCenter, "No Image" if poster is NO_POSTER else "Loading...")
+
+        if row is not None:
+            movie_id, title, genre, _, description = row[:5]
+            y = poster_rect.bottom() + 6
+            painter.setPen(QColor("white"))
+            painter.setFont(self.title_font)
+            painter.drawText(
+                QRect(card.x() + 10, y, POSTER_WIDTH, 40),
+                Qt.AlignCenter | Qt.TextWordWrap,
+                title,
+            )
+            y += 45
+            painter.setPen(QColor("#aaa"))
+            painter.setFont(self.genre_font)
+            painter.drawText(QRect(card.x() + 10, y, POSTER_WIDTH, 15), Qt.AlignCenter, genre or "Unknown Genre")
+            y += 20
+            painter.setPen(QColor("#ccc"))
+            painter.setFont(self.desc_font)
+            painter.drawText(
+                QRect(card.x() + 10, y, POSTER_WIDTH, 35),
+                Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap,
+                self.elided_description(movie_id, description),
+            )
+
+            button = self.button_rect(option)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(QColor("#ffc947") if hovered else QColor("#ffb400")))
+            painter.drawRoundedRect(QRectF(button), 15, 15)
+            painter.setPen(QColor("black"))
+            painter.setFont(self.button_font)
+            painter.drawText(button, Qt.AlignCenter, "Book Now")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and index.data(RowRole) is not None
+            and self.button_rect(option).contains(event.position().toPoint())
+        ):
+            self.bookRequested.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+def create_movie_list_view(parent=None):
+    """A wrapping icon-mode QListView laid out like the old card grid."""
+    view = QListView(parent)
+    view.setViewMode(QListView.IconMode)
+    view.setFlow(QListView.LeftToRight)
+    view.setWrapping(True)
+    view.setResizeMode(QListView.Adjust)
+    view.setMovement(QListView.Static)
+    view.setUniformItemSizes(True)
+    view.setGridSize(QSize(CARD_WIDTH + CARD_SPACING, CARD_HEIGHT + CARD_SPACING))
+    view.setSelectionMode(QListView.NoSelection)
+    view.setVerticalScrollMode(QListView.ScrollPerPixel)
+    view.setMouseTracking(True)
+    view.setFocusPolicy(Qt.NoFocus)
+    return view
+
+
+def visible_range(view):
+    """(first, stop) model rows inside the viewport of a view from create_movie_list_view()."""
+    grid = view.gridSize()
+    per_line = max(1, view.viewport().width() // grid.width())
+    top = view.verticalScrollBar().value()
+    first_line = top // grid.height()
+    last_line = (top + view.viewport().height()) // grid.height()
+    count = view.model().rowCount() if view.model() is not None else 0
+    return min(count, first_line * per_line), min(count, (last_line + 1) * per_line)
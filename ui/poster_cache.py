@@ -0,0 +1,280 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRectF, QRunnable, QSize, Qt, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPixmap
+
+from config import settings
+from services.poster_store import PosterStore, url_key
+from services.poster_thumbnails import CARD, DETAIL, TEMP_PREFIX, VARIANTS, Thumbnailer
+
+# ShowtimeView shows the DETAIL variant with rounded corners; grid cards
+# show the CARD variant and clip it themselves.
+DETAIL_SIZE = VARIANTS[DETAIL][:2]
+DETAIL_RADIUS = 18
+DECODE_THREADS = 2
+
+
+def poster_key(url):
+    return url_key(url) if url else None
+
+
+def rounded_image(image, radius=DETAIL_RADIUS):
+    """Copy of `image` with rounded, transparent corners. Safe off the GUI thread."""
+    target = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+    target.fill(Qt.transparent)
+    painter = QPainter(target)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, image.width(), image.height()), radius, radius)
+    painter.setClipPath(path)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return target
+
+
+def decode_variant(path, thumb_path, variant):
+    """Decodes the display `variant` of a poster into a QImage; a null one if it does not decode.
+
+    Reads the pre-rendered thumbnail when there is one. Otherwise the full
+    poster is read through QImageReader.setScaledSize(), which lets the JPEG
+    decoder downscale while decoding instead of materializing the full
+    image first.
+    """
+    width, height, fit = VARIANTS[variant]
+    if os.path.exists(thumb_path):
+        image = QImageReader(thumb_path).read()
+    else:
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        if source_size.isValid():
+            mode = Qt.KeepAspectRatioByExpanding if fit == "cover" else Qt.KeepAspectRatio
+            reader.setScaledSize(source_size.scaled(QSize(width, height), mode))
+        image = reader.read()
+        if fit == "cover" and not image.isNull():
+            image = image.copy(
+                (image.width() - width) // 2, (image.height() - height) // 2, width, height
+            )
+    if image.isNull():
+        return image
+    return rounded_image(image) if variant == DETAIL else image
+
+
+class _DecodeSignals(QObject):
+    finished = Signal(str, str, QImage)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, key, variant, path, thumb_path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.variant = variant
+        self.path = path
+        self.thumb_path = thumb_path
+        self.signals = _DecodeSignals()
+
+    def run(self):
+        try:
+            image = decode_variant(self.path, self.thumb_path, self.variant)
+        except Exception:
+            image = QImage()
+        try:
+            self.signals.finished.emit(self.key, self.variant, image)
+        except RuntimeError:
+            pass
+
+
+class DiskCache:
+    """A PosterStore kept under a byte budget by evicting the least recently used posters.
+
+    Use order is the file mtime, bumped on every read, so it carries over
+    between runs. Posters are written by PosterStore.download(); call
+    stored() afterwards so the new bytes count against the budget. Posters
+    sharing an image are counted once per URL, which errs on the safe side.
+    """
+
+    def __init__(self, store, max_bytes):
+        self.store = store
+        self.directory = store.links_dir
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._files = OrderedDict()  # key -> size, least recently used first
+        self._bytes = 0
+        self._scan()
+
+    def _scan(self):
+        thumb_bytes = {}
+        with os.scandir(self.store.thumbs_dir) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(TEMP_PREFIX):
+                    key = entry.name.split(".", 1)[0]
+                    thumb_bytes[key] = thumb_bytes.get(key, 0) + entry.stat().st_size
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(TEMP_PREFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, entry.name, st.st_size + thumb_bytes.get(entry.name, 0)))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._bytes += size
+
+    def get(self, key):
+        """Path of the cached poster for `key`, or None; counts as a use."""
+        with self._lock:
+            if key not in self._files:
+                self.misses += 1
+                return None
+            self._files.move_to_end(key)
+            self.hits += 1
+        path = self.store.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._bytes -= self._files.pop(key, 0)
+            return None
+        return path
+
+    def stored(self, key):
+        """Accounts for a poster just stored under `key` and evicts down to the budget."""
+        size = self.store.size(key)
+        if not size:
+            return
+        evicted = []
+        with self._lock:
+            self._bytes += size - self._files.pop(key, 0)
+            self._files[key] = size
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                old_key, old_size = self._files.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            self.store.remove(old_key)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._files)
+
+
+class PosterCache(QObject):
+    """Decoded poster pixmaps in memory on top of the poster files on disk.
+
+    pixmap() returns a ready-to-draw display variant keyed by (poster,
+    variant): the thumbnail rendered when the poster was stored, rounded for
+    DETAIL, so views never rescale or repaint a poster they have shown
+    before. On a miss, load() decodes the file on a worker thread into a
+    QImage; it becomes a QPixmap on the GUI thread and posterDecoded fires.
+    The memory tier is an LRU capped by pixmap bytes; the disk tier is a
+    DiskCache. Use shared_poster_cache() so every window shares both tiers.
+    """
+
+    posterDecoded = Signal(str, str)  # key, variant
+
+    def __init__(self, store, disk_max_bytes, memory_max_bytes, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.disk = DiskCache(store, disk_max_bytes)
+        self.memory_max_bytes = memory_max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._pixmaps = OrderedDict()  # (key, variant) -> QPixmap
+        self._bytes = 0
+        self._broken = set()  # keys whose file did not decode, until stored() again
+        self._decoding = {}  # (key, variant) -> task queued on the pool
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(DECODE_THREADS)
+
+    def stored(self, key):
+        """Call after a poster was stored under `key`; drops variants of any older file."""
+        self._broken.discard(key)
+        for cache_key in [k for k in self._pixmaps if k[0] == key]:
+            old = self._pixmaps.pop(cache_key)
+            self._bytes -= old.width() * old.height() * 4
+        self.disk.stored(key)
+
+    def pixmap(self, key, variant=CARD):
+        """The decoded `variant` of poster `key`, or None if it is not in memory.
+
+        A poster whose file did not decode gives a null QPixmap.
+        """
+        if key in self._broken:
+            return QPixmap()
+        cache_key = (key, variant)
+        pix = self._pixmaps.get(cache_key)
+        if pix is not None:
+            self._pixmaps.move_to_end(cache_key)
+            self.hits += 1
+            return pix
+        self.misses += 1
+        return None
+
+    def load(self, key, variant=CARD):
+        """Starts decoding `variant` of `key` in the background.
+
+        Returns False when the poster is not on disk, so the caller has to
+        download it first.
+        """
+        cache_key = (key, variant)
+        if cache_key in self._decoding:
+            return True
+        path = self.disk.get(key)
+        if path is None:
+            return False
+        task = _DecodeTask(key, variant, path, self.store.thumbnail_path(key, variant))
+        task.signals.finished.connect(self._on_decoded)
+        self._decoding[cache_key] = task
+        self.pool.start(task)
+        return True
+
+    def _on_decoded(self, key, variant, image):
+        self._decoding.pop((key, variant), None)
+        if image.isNull():
+            self._broken.add(key)
+        else:
+            self._insert((key, variant), QPixmap.fromImage(image))
+        self.posterDecoded.emit(key, variant)
+
+    def _insert(self, cache_key, pix):
+        self._pixmaps[cache_key] = pix
+        self._bytes += pix.width() * pix.height() * 4
+        while self._bytes > self.memory_max_bytes and len(self._pixmaps) > 1:
+            _, old = self._pixmaps.popitem(last=False)
+            self._bytes -= old.width() * old.height() * 4
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "memory_hits": self.hits,
+            "memory_misses": self.misses,
+            "memory_evictions": self.evictions,
+            "memory_items": len(self._pixmaps),
+            "memory_bytes": self._bytes,
+            "disk_hits": self.disk.hits,
+            "disk_misses": self.disk.misses,
+            "disk_evictions": self.disk.evictions,
+            "disk_files": len(self.disk),
+            "disk_bytes": self.disk.size_bytes,
+        }
+
+
+_cache = None
+
+
+def shared_poster_cache():
+    global _cache
+    if _cache is None:
+        _cache = PosterCache(
+            PosterStore(settings.ui.poster_cache_dir, Thumbnailer()),
+            settings.ui.poster_disk_cache_mb * 1024 * 1024,
+            settings.ui.poster_memory_cache_mb * 1024 * 1024,
+        )
+    return _cache
@@ -0,0 +1,144 @@
+import threading
+import traceback
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from services.poster_store import DownloadCancelled, InvalidPoster
+
+MAX_DOWNLOADS = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def shared_session():
+    """One keep-alive HTTP session for every poster download in the process."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_DOWNLOADS, pool_maxsize=MAX_DOWNLOADS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+class _DownloadSignals(QObject):
+    finished = Signal(object, str, str)  # key, "done" / "failed" / "cancelled", path or error
+
+
+class _DownloadTask(QRunnable):
+    def __init__(self, key, fetch, session, url):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.fetch = fetch
+        self.session = session
+        self.url = url
+        self.cancelled = False
+        self.signals = _DownloadSignals()
+
+    def run(self):
+        if self.cancelled:
+            self._emit("cancelled", "")
+            return
+        try:
+            path = self.fetch(self.session, self.url, lambda: self.cancelled)
+        except DownloadCancelled:
+            self._emit("cancelled", "")
+        except Exception as e:
+            if not isinstance(e, (requests.RequestException, InvalidPoster)):
+                traceback.print_exc()
+            self._emit("failed", str(e))
+        else:
+            self._emit("done", path)
+
+    def _emit(self, status, detail):
+        try:
+            self.signals.finished.emit(self.key, status, detail)
+        except RuntimeError:
+            # The loader was destroyed while the download was running
+            pass
+
+
+class PosterLoader(QObject):
+    """Downloads posters on a small dedicated thread pool, in the order they are asked for.
+
+    `fetch(session, url, is_cancelled)` does the work on a worker thread
+    (normally PosterStore.download) and returns the stored path. request()
+    queues a download and returns immediately; posterLoaded fires on the
+    GUI thread once the file is on disk. At most `max_workers`
+    downloads run at once, all sharing one HTTP session. retain() drops
+    every queued download not in the given keys and stops the running ones
+    between chunks, so scrolling away from a screen of cards frees the pool
+    for the cards that replaced them. A poster that fails is not retried
+    until reset_failures().
+    """
+
+    posterLoaded = Signal(object, str)  # key, path
+    posterFailed = Signal(object, str)  # key, error
+
+    def __init__(self, fetch, parent=None, max_workers=MAX_DOWNLOADS, session=None):
+        super().__init__(parent)
+        self.fetch = fetch
+        self.session = session or shared_session()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.max_workers = max_workers
+        self._pending = OrderedDict()  # key -> url, oldest request first
+        self._active = {}              # key -> running task
+        self._failed = set()
+
+    def request(self, key, url):
+        if not url or key in self._pending or key in self._failed:
+            return
+        task = self._active.get(key)
+        if task is not None and not task.cancelled:
+            return
+        # A cancelled download still winding down is queued again and
+        # restarts once it has finished
+        self._pending[key] = url
+        self._dispatch()
+
+    def has_failed(self, key):
+        return key in self._failed
+
+    def retain(self, keys):
+        keys = set(keys)
+        for key in [k for k in self._pending if k not in keys]:
+            del self._pending[key]
+        for key, task in self._active.items():
+            if key not in keys:
+                task.cancelled = True
+
+    def cancel_all(self):
+        self.retain(())
+
+    def reset_failures(self):
+        self._failed.clear()
+
+    def _dispatch(self):
+        for key in list(self._pending):
+            if len(self._active) >= self.max_workers:
+                break
+            if key in self._active:
+                continue
+            url = self._pending.pop(key)
+            task = _DownloadTask(key, self.fetch, self.session, url)
+            task.signals.finished.connect(self._on_finished)
+            self._active[key] = task
+            self.pool.start(task)
+
+    def _on_finished(self, key, status, detail):
+        self._active.pop(key, None)
+        if status == "done":
+            # It may have finished just after being cancelled and queued again
+            self._pending.pop(key, None)
+            self.posterLoaded.emit(key, detail)
+        elif status == "failed":
+            self._failed.add(key)
+            self.posterFailed.emit(key, detail)
+        self._dispatch()
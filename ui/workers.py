@@ -0,0 +1,108 @@
+import itertools
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _TaskSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class _Task(QRunnable):
+    def __init__(self, token, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.signals = _TaskSignals()
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self._emit(self.signals.failed, str(e))
+        else:
+            self._emit(self.signals.finished, result)
+
+    def _emit(self, signal, payload):
+        if self.cancelled:
+            return
+        try:
+            signal.emit(self.token, payload)
+        except RuntimeError:
+            # The receiving window was destroyed while the task was running
+            pass
+
+
+class BackgroundRunner(QObject):
+    """Runs blocking calls on a QThreadPool and delivers results on the GUI thread.
+
+    Every task is submitted on a named channel. Submitting a new task on a
+    channel cancels whatever is still pending on it, so only the most recent
+    request's callback ever fires (e.g. when the user flips through dates
+    faster than the database answers).
+    """
+
+    _tokens = itertools.count(1)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._tasks = {}  # token -> (channel, task, on_result, on_error)
+        self._latest = {}  # channel -> token
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, **kwargs):
+        self.cancel(channel)
+
+        token = next(self._tokens)
+        task = _Task(token, fn, args, kwargs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+
+        self._tasks[token] = (channel, task, on_result, on_error)
+        self._latest[channel] = token
+        self.pool.start(task)
+        return token
+
+    def cancel(self, channel):
+        token = self._latest.pop(channel, None)
+        if token is None:
+            return
+        entry = self._tasks.pop(token, None)
+        if entry:
+            task = entry[1]
+            task.cancelled = True
+            self.pool.tryTake(task)
+
+    def cancel_all(self):
+        for channel in list(self._latest):
+            self.cancel(channel)
+
+    def is_pending(self, channel):
+        return channel in self._latest
+
+    def _pop(self, token):
+        entry = self._tasks.pop(token, None)
+        if entry is None:
+            return None
+        channel = entry[0]
+        if self._latest.get(channel) == token:
+            del self._latest[channel]
+        return entry
+
+    def _on_finished(self, token, result):
+        entry = self._pop(token)
+        if entry and entry[2]:
+            entry[2](result)
+
+    def _on_failed(self, token, message):
+        entry = self._pop(token)
+        if entry and entry[3]:
+            entry[3](message)
\ No newline at end of file
@@ -1,4 +1,3 @@
-import requests
 import os
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -7,32 +6,57 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QWidget,
     QPushButton,
-    QScrollArea,
-    QGridLayout,
-    QFrame,
     QLineEdit,
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QCursor, QIcon, QFontMetrics
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QPixmap, QCursor, QIcon
+from config import settings
 from db.movie_repo import MovieRepo
+from services.movie_search import MovieSearchIndex
+from ui.movie_grid import (
+    NO_POSTER, MovieCardDelegate, MovieListModel, RowRole, create_movie_list_view, visible_range,
+)
+from ui.poster_cache import CARD, poster_key, shared_poster_cache
+from ui.poster_loader import PosterLoader
+from ui.workers import BackgroundRunner
 from views.showtime_view import ShowtimeView
 
+# Keystrokes closer together than this are searched as one query
+SEARCH_DEBOUNCE_MS = 200
+# How long scrolling has to settle before off-screen poster downloads are dropped
+POSTER_RETAIN_DELAY_MS = 150
+
 
 class MainView(QMainWindow):
     def __init__(self, user_id=None, username=None, role="guest"):
         super().__init__()
-        self.cache_dir = "posters_cache"
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
-
         self.user_id = user_id
         self.username = username if username else "Guest"
         self.role = role if role else "guest"
         self.movie_repo = MovieRepo()
 
-        self.all_movie_data = []
-        self.current_page_index = 0
-        self.movies_per_page = 50
+        self.total_movies = 0
+        self.search_text = ""
+        # Small catalogs are kept in memory and searched locally
+        self.search_index = None
+        self.catalog_by_id = {}
+
+        self.runner = BackgroundRunner(self)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_movies)
+
+        self.poster_cache = shared_poster_cache()
+        self.poster_cache.posterDecoded.connect(self.on_poster_decoded)
+        self.poster_waiters = {}  # poster key -> ids of the cards waiting for its decode
+        self.poster_loader = PosterLoader(self.poster_cache.store.download, self)
+        self.poster_loader.posterLoaded.connect(self.on_poster_loaded)
+        self.poster_loader.posterFailed.connect(self.on_poster_failed)
+        self.retain_timer = QTimer(self)
+        self.retain_timer.setSingleShot(True)
+        self.retain_timer.setInterval(POSTER_RETAIN_DELAY_MS)
+        self.retain_timer.timeout.connect(self.retain_visible_posters)
 
         self.setWindowTitle("CineBooking - Browse Movies")
 
@@ -100,7 +124,8 @@ class MainView(QMainWindow):
             }
         """
         )
-        self.search_bar.textChanged.connect(self.filter_movies)
+        # Every keystroke restarts the timer; the search runs once typing pauses
+        self.search_bar.textChanged.connect(self.search_timer.start)
         navbar.addWidget(self.search_bar)
 
         navbar.addSpacing(20)
@@ -131,11 +156,20 @@ class MainView(QMainWindow):
 
         self.main_layout.addLayout(navbar)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet(
+        self.movie_model = MovieListModel(self)
+        self.movie_model.poster_provider = self.get_poster
+        self.movie_model.rowsRequested.connect(self.load_movie_rows)
+
+        self.movie_list = create_movie_list_view()
+        self.movie_list.setModel(self.movie_model)
+        delegate = MovieCardDelegate(self.movie_list)
+        delegate.bookRequested.connect(self.on_book_requested)
+        self.movie_list.setItemDelegate(delegate)
+        self.movie_list.verticalScrollBar().valueChanged.connect(self.retain_timer.start)
+        self.movie_model.modelReset.connect(self.retain_timer.start)
+        self.movie_list.setStyleSheet(
             """
-            QScrollArea {
+            QListView {
                 background: transparent;
                 border: none;
             }
@@ -155,66 +189,14 @@ class MainView(QMainWindow):
             }
         """
         )
+        self.main_layout.addWidget(self.movie_list)
 
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background: transparent;")
-
-        self.movie_grid = QGridLayout(scroll_content)
-        self.movie_grid.setSpacing(25)
-        self.movie_grid.setContentsMargins(10, 10, 10, 10)
-
-        scroll.setWidget(scroll_content)
-        self.main_layout.addWidget(scroll)
-
-        pagination_layout = QHBoxLayout()
-        self.btn_prev = QPushButton("← Previous")
-        self.btn_next = QPushButton("Next →")
-
-        pagination_style = """
-            QPushButton {
-                background-color: rgba(255, 255, 255, 0.1);
-                color: white;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 20px;
-                padding: 10px 30px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.2);
-                border: 1px solid #ffb400;
-                color: #ffb400;
-            }
-            QPushButton:disabled {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #777;
-                border: 1px solid rgba(255, 255, 255, 0.05);
-            }
-        """
-        self.btn_prev.setStyleSheet(pagination_style)
-        self.btn_next.setStyleSheet(pagination_style)
-        self.btn_prev.setCursor(QCursor(Qt.PointingHandCursor))
-        self.btn_next.setCursor(QCursor(Qt.PointingHandCursor))
-
-        self.btn_prev.clicked.connect(self.prev_page)
-        self.btn_next.clicked.connect(self.next_page)
-
-        self.page_label = QLabel()
-        self.page_label.setStyleSheet(
+        self.count_label = QLabel()
+        self.count_label.setAlignment(Qt.AlignCenter)
+        self.count_label.setStyleSheet(
             "color: #ccc; font-size: 14px; font-weight: bold;"
         )
-
-        pagination_layout.addStretch()
-        self.btn_prev.setMinimumWidth(120)
-        self.btn_next.setMinimumWidth(120)
-        pagination_layout.addWidget(self.btn_prev)
-        pagination_layout.addSpacing(15)
-        pagination_layout.addWidget(self.page_label)
-        pagination_layout.addSpacing(15)
-        pagination_layout.addWidget(self.btn_next)
-        pagination_layout.addStretch()
-
-        self.main_layout.addLayout(pagination_layout)
+        self.main_layout.addWidget(self.count_label)
 
         self.load_all_data()
 
@@ -246,175 +228,157 @@ class MainView(QMainWindow):
         super().resizeEvent(event)
 
     def load_all_data(self):
-        self.all_movie_data = self.movie_repo.get_all_movies()[:250]
-        self.update_page_display()
-
-    def update_page_display(self):
-        total = len(self.all_movie_data)
-        start = self.current_page_index * self.movies_per_page
-        end = start + self.movies_per_page
-        movies_to_show = self.all_movie_data[start:end]
-        self.display_movies(movies_to_show, start_rank=start + 1)
-
-        total_pages = max(1, (total + self.movies_per_page - 1) // self.movies_per_page)
-        self.page_label.setText(f"Page {self.current_page_index + 1} / {total_pages}")
-
-        self.btn_prev.setEnabled(self.current_page_index > 0)
-        self.btn_next.setEnabled(end < total)
-
-    def display_movies(self, movies_to_show, start_rank):
-        while self.movie_grid.count():
-            child = self.movie_grid.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        columns = 5
-
-        for i, m in enumerate(movies_to_show):
-            movie_id = m[0]
-            title = m[1]
-            genre = m[2]
-            description = m[4]
-            poster_url = m[5]
-
-            card = QFrame()
-            card.setFixedSize(200, 420)
-            card.setStyleSheet(
-                """
-                QFrame {
-                    background-color: rgba(30, 30, 30, 0.7);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                }
-                QFrame:hover {
-                    background-color: rgba(50, 50, 50, 0.9);
-                    border: 1px solid #ffb400;
-                }
-            """
-            )
-
-            layout = QVBoxLayout(card)
-            layout.setContentsMargins(10, 10, 10, 15)
-            layout.setSpacing(5)
-
-            img_lbl = QLabel()
-            img_lbl.setFixedSize(180, 260)
-            img_lbl.setStyleSheet(
-                "border-radius: 8px; border: none; background: transparent;"
-            )
-            img_lbl.setAlignment(Qt.AlignCenter)
-
-            pix = self.get_cached_poster(movie_id, poster_url)
-            if pix:
-                img_lbl.setPixmap(
-                    pix.scaled(180, 260, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                )
-            else:
-                img_lbl.setText("No Image")
-                img_lbl.setStyleSheet(
-                    "color: #777; font-size: 12px; border: 1px dashed #555;"
-                )
-
-            title_lbl = QLabel(title)
-            title_lbl.setStyleSheet(
-                """
-                font-weight: bold; 
-                font-size: 14px; 
-                color: white; 
-                background: transparent; 
-                border: none;
-            """
-            )
-            title_lbl.setWordWrap(True)
-            title_lbl.setAlignment(Qt.AlignCenter)
-            title_lbl.setFixedHeight(40)
-
-            genre_lbl = QLabel(genre if genre else "Unknown Genre")
-            genre_lbl.setStyleSheet(
-                "color: #aaa; font-size: 11px; background: transparent; border: none;"
-            )
-            genre_lbl.setAlignment(Qt.AlignCenter)
-            genre_lbl.setFixedHeight(15)
+        self.count_label.setText("Loading movies...")
+        self.runner.submit(
+            "catalog",
+            self.fetch_catalog,
+            on_result=self.on_catalog_loaded,
+            on_error=self.on_catalog_failed,
+        )
 
-            desc_lbl = QLabel()
-            desc_lbl.setStyleSheet(
-                "color: #ccc; font-size: 11px; background: transparent; border: none;"
+    def fetch_catalog(self):
+        """Runs on a worker thread: the movie count, and the catalog with its search index if it is small."""
+        total = self.movie_repo.count_movies()
+        if total > settings.ui.local_search_max_movies:
+            return total, None, None
+        catalog = self.movie_repo.get_catalog()
+        return total, catalog, MovieSearchIndex.from_rows(catalog)
+
+    def on_catalog_loaded(self, result):
+        self.total_movies, catalog, search_index = result
+        if catalog is not None:
+            self.catalog_by_id = {row[0]: row for row in catalog}
+            self.search_index = search_index
+        if not self.search_text:
+            self.show_catalog()
+        elif self.search_index is not None:
+            # Typed while the catalog was loading: search it locally instead
+            self.runner.cancel("search")
+            self.show_movies(self.search_index.search(self.search_text))
+
+    def on_catalog_failed(self, message):
+        self.count_label.setText("Could not load movies.")
+        print(f"Error loading movies: {message}")
+
+    def show_catalog(self):
+        if self.search_index is not None:
+            self.runner.cancel("search")
+            self.show_movies(list(self.catalog_by_id))
+        else:
+            # On the "search" channel, so a query typed meanwhile replaces it
+            self.count_label.setText("Loading movies...")
+            self.runner.submit(
+                "search",
+                self.movie_repo.get_movie_ids,
+                on_result=lambda ids: self.on_search_loaded("", ids),
+                on_error=self.on_catalog_failed,
             )
-            desc_lbl.setAlignment(Qt.AlignCenter)
-            desc_lbl.setWordWrap(True)
-            desc_lbl.setFixedHeight(35)
 
-            full_description = (
-                description if description else "No description available."
-            )
-            metrics = QFontMetrics(desc_lbl.font())
-            elided_desc = metrics.elidedText(full_description, Qt.ElideRight, 180 * 2)
-            desc_lbl.setText(elided_desc)
-
-            btn = QPushButton("Book Now")
-            btn.setCursor(QCursor(Qt.PointingHandCursor))
-            btn.setStyleSheet(
-                """
-                QPushButton {
-                    background-color: #ffb400;
-                    color: black;
-                    border: none;
-                    border-radius: 15px;
-                    padding: 5px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #ffc947;
-                }
-            """
-            )
-            btn.clicked.connect(
-                lambda checked, mid=movie_id, mt=title, md=full_description: self.book_movie(
-                    mid, mt, md
-                )
-            )
+    def show_movies(self, ids):
+        """Points the grid at `ids`; rows not already in memory are loaded as they scroll into view."""
+        self.movie_model.set_ids(ids, self.catalog_by_id)
+        self.movie_list.scrollToTop()
+        if self.search_text:
+            self.count_label.setText(f"{len(ids)} results for \"{self.search_text}\"")
+        else:
+            self.count_label.setText(f"{len(ids)} movies")
+
+    def load_movie_rows(self, block, ids):
+        # One channel per block: a block re-requested after a new result set
+        # replaces the stale load instead of running twice
+        self.runner.submit(
+            f"rows-{block}",
+            self.movie_repo.get_movie_cards,
+            ids,
+            on_result=lambda rows, b=block: self.movie_model.add_rows(b, rows),
+            on_error=lambda message, b=block: self.on_rows_failed(b, message),
+        )
 
-            layout.addWidget(img_lbl)
-            layout.addWidget(title_lbl)
-            layout.addWidget(genre_lbl)
-            layout.addWidget(desc_lbl)
-            layout.addWidget(btn)
-
-            self.movie_grid.addWidget(card, i // columns, i % columns)
-
-    def get_cached_poster(self, movie_id, url):
-        cache_path = os.path.join(self.cache_dir, f"movie_{movie_id}.jpg")
-        if os.path.exists(cache_path):
-            return QPixmap(cache_path)
-        try:
-            res = requests.get(url, timeout=3)
-            with open(cache_path, "wb") as f:
-                f.write(res.content)
-            return QPixmap(cache_path)
-        except:
+    def on_rows_failed(self, block, message):
+        print(f"Error loading movies: {message}")
+        self.movie_model.block_failed(block)
+
+    def get_poster(self, movie_id, url):
+        """The card-sized poster if it is decoded; otherwise queues its decode or download and returns None."""
+        if not url:
+            return NO_POSTER
+        key = poster_key(url)
+        pix = self.poster_cache.pixmap(key, CARD)
+        if pix is not None:
+            return pix if not pix.isNull() else NO_POSTER
+        if self.poster_cache.load(key, CARD):
+            self.poster_waiters.setdefault(key, set()).add(movie_id)
             return None
-
-    def book_movie(self, mid, mt, md):
+        if self.poster_loader.has_failed(movie_id):
+            return NO_POSTER
+        # Cards are painted top-left first, so the visible posters queue in reading order
+        self.poster_loader.request(movie_id, url)
+        return None
+
+    def on_poster_loaded(self, movie_id, path):
+        # PosterStore files are named by their key; repainting the card starts the decode
+        self.poster_cache.stored(os.path.basename(path))
+        self.movie_model.poster_ready(movie_id)
+
+    def on_poster_decoded(self, key, variant):
+        if variant == CARD:
+            for movie_id in self.poster_waiters.pop(key, ()):
+                self.movie_model.poster_ready(movie_id)
+
+    def on_poster_failed(self, movie_id, message):
+        self.movie_model.poster_ready(movie_id)
+
+    def retain_visible_posters(self):
+        """Drops the poster downloads of cards that have scrolled out of view."""
+        first, stop = visible_range(self.movie_list)
+        self.poster_loader.retain(self.movie_model.ids_between(first, stop))
+
+    def on_book_requested(self, index):
+        row = index.data(RowRole)
+        description = row[4] if row[4] else "No description available."
+        self.book_movie(row[0], row[1], description, row[5])
+
+    def book_movie(self, mid, mt, md, poster_url=None):
         self.sw = ShowtimeView(
-            mid, mt, self.user_id, self.username, self.role, description=md
+            mid, mt, self.user_id, self.username, self.role, description=md,
+            poster_url=poster_url,
         )
         self.sw.showMaximized()
         self.close()
 
-    def next_page(self):
-        self.current_page_index += 1
-        self.update_page_display()
+    def filter_movies(self):
+        text = self.search_bar.text().strip()
+        if text == self.search_text:
+            return
+        self.search_text = text
+        if not text:
+            self.show_catalog()
+        elif self.search_index is not None:
+            self.show_movies(self.search_index.search(text))
+        else:
+            # Submitting on the "search" channel drops any older query still in flight
+            self.runner.submit(
+                "search",
+                self.movie_repo.search_ids,
+                text,
+                on_result=lambda ids, t=text: self.on_search_loaded(t, ids),
+                on_error=self.on_search_failed,
+            )
+
+    def on_search_loaded(self, text, ids):
+        if text != self.search_text:
+            return
+        self.show_movies(ids)
 
-    def prev_page(self):
-        if self.current_page_index > 0:
-            self.current_page_index -= 1
-            self.update_page_display()
+    def on_search_failed(self, message):
+        print(f"Error searching movies: {message}")
 
-    def filter_movies(self):
-        text = self.search_bar.text().lower()
-        filtered = [m for m in self.all_movie_data if text in m[1].lower()]
-        self.display_movies(filtered, 1)
+    def closeEvent(self, event):
+        self.search_timer.stop()
+        self.retain_timer.stop()
+        self.runner.cancel_all()
+        self.poster_loader.cancel_all()
+        super().closeEvent(event)
 
     def handle_auth_action(self):
         if self.role == "guest":
@@ -12,9 +12,15 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QScrollArea,
 )
-from PySide6.QtGui import QPixmap, QCursor, QIcon, QPainter, QPainterPath
-from PySide6.QtCore import Qt, QRectF
-from db.connection import get_db_connection
+from PySide6.QtGui import QPixmap, QCursor, QIcon
+from PySide6.QtCore import Qt
+from db.booking_repo import BookingRepo
+from db.movie_repo import MovieRepo
+from db.seat_map import SEAT_COLS, SEAT_ROWS
+from db.showtime_repo import ShowtimeRepo
+from ui.poster_cache import DETAIL, DETAIL_SIZE, poster_key, shared_poster_cache
+from ui.poster_loader import PosterLoader
+from ui.workers import BackgroundRunner
 
 
 class ShowtimeView(QWidget):
@@ -26,6 +32,7 @@ class ShowtimeView(QWidget):
         username="Guest",
         role="guest",
         description=None,
+        poster_url=None,
     ):
         super().__init__()
         self.movie_id = movie_id
@@ -34,6 +41,8 @@ class ShowtimeView(QWidget):
         self.username = username
         self.role = role
         self.description = description
+        self.poster_url = poster_url
+        self.poster_decoding = False
 
         self.movie_genre = "Action / Sci-Fi"
         self.movie_duration = "2h 15m"
@@ -41,6 +50,15 @@ class ShowtimeView(QWidget):
         self.selected_seats = []
         self.showtimes_data = []
 
+        self.showtime_repo = ShowtimeRepo()
+        self.movie_repo = MovieRepo()
+        self.booking_repo = BookingRepo()
+        self.runner = BackgroundRunner(self)
+        self.poster_cache = shared_poster_cache()
+        self.poster_cache.posterDecoded.connect(self.on_poster_decoded)
+        self.poster_loader = PosterLoader(self.poster_cache.store.download, self)
+        self.poster_loader.posterLoaded.connect(self.on_poster_downloaded)
+
         self.premium_surcharge = 5.0
         self.premium_rows_start_index = 6
 
@@ -113,25 +131,18 @@ class ShowtimeView(QWidget):
         left_layout.addWidget(btn_back)
 
         poster_pix = self.load_local_poster()
-        poster_lbl = QLabel()
-        poster_lbl.setFixedSize(320, 460)
-        poster_lbl.setAlignment(Qt.AlignCenter)
-        poster_lbl.setStyleSheet("background: transparent; border: none;")
+        self.poster_lbl = QLabel()
+        self.poster_lbl.setFixedSize(*DETAIL_SIZE)
+        self.poster_lbl.setAlignment(Qt.AlignCenter)
 
         if poster_pix:
-            scaled = poster_pix.scaled(
-                poster_lbl.width(),
-                poster_lbl.height(),
-                Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation,
-            )
-            poster_lbl.setPixmap(self.make_rounded_pixmap(scaled, radius=18))
+            self.show_poster(poster_pix)
         else:
-            poster_lbl.setText("No poster")
-            poster_lbl.setStyleSheet(
+            self.poster_lbl.setText("No poster")
+            self.poster_lbl.setStyleSheet(
                 "color: rgba(255,255,255,0.35); background: transparent; border: none;"
             )
-        left_layout.addWidget(poster_lbl)
+        left_layout.addWidget(self.poster_lbl)
 
         lbl_title = QLabel(self.movie_title)
         lbl_title.setStyleSheet(
@@ -147,15 +158,15 @@ class ShowtimeView(QWidget):
         )
         left_layout.addWidget(lbl_meta)
 
-        desc_scroll = QLabel(
+        self.desc_scroll = QLabel(
             self.description if self.description else "No description available."
         )
-        desc_scroll.setStyleSheet(
+        self.desc_scroll.setStyleSheet(
             "color: #ccc; font-size: 14px; line-height: 1.4; background: transparent; border: none;"
         )
-        desc_scroll.setWordWrap(True)
-        desc_scroll.setAlignment(Qt.AlignTop)
-        left_layout.addWidget(desc_scroll)
+        self.desc_scroll.setWordWrap(True)
+        self.desc_scroll.setAlignment(Qt.AlignTop)
+        left_layout.addWidget(self.desc_scroll)
 
         left_layout.addStretch()
         left_scroll_area.setWidget(left_content_widget)
@@ -338,6 +349,9 @@ class ShowtimeView(QWidget):
 
         self.hide_booking_interface()
 
+        self.load_description()
+        if poster_pix is None:
+            self.load_poster()
         self.load_dates()
 
     def hide_booking_interface(self):
@@ -369,6 +383,11 @@ class ShowtimeView(QWidget):
         self.overlay.setStyleSheet("background-color: rgba(0, 0, 0, 0.85);")
         self.overlay.lower()
 
+    def closeEvent(self, event):
+        self.runner.cancel_all()
+        self.poster_loader.cancel_all()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         if hasattr(self, "bg_label") and self.bg_label:
             self.bg_label.resize(self.size())
@@ -394,60 +413,88 @@ class ShowtimeView(QWidget):
         container.addSpacing(15)
         layout.addLayout(container)
 
+    def load_description(self):
+        # The catalog grid only carries a truncated description
+        self.runner.submit(
+            "description",
+            self.movie_repo.get_movie_description,
+            self.movie_id,
+            on_result=self.on_description_loaded,
+        )
+
+    def on_description_loaded(self, description):
+        if description:
+            self.description = description
+            self.desc_scroll.setText(description)
+
+    def set_placeholder(self, text):
+        self.hide_booking_interface()
+        self.placeholder_lbl.setText(text)
+
     def load_dates(self):
+        self.date_combo.blockSignals(True)
         self.date_combo.clear()
-        conn = get_db_connection()
-        if not conn:
-            return
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT DISTINCT start_time::date FROM showtimes 
-            WHERE movie_id = %s ORDER BY start_time::date
-        """,
-            (self.movie_id,),
+        self.date_combo.addItem("Loading dates...")
+        self.date_combo.setEnabled(False)
+        self.date_combo.blockSignals(False)
+        self.time_combo.clear()
+        self.time_combo.setEnabled(False)
+        self.set_placeholder("Loading showtimes...")
+
+        self.runner.submit(
+            "dates",
+            self.showtime_repo.get_show_dates,
+            self.movie_id,
+            on_result=self.on_dates_loaded,
+            on_error=self.on_load_failed,
         )
-        dates = cur.fetchall()
 
+    def on_dates_loaded(self, dates):
+        self.date_combo.blockSignals(True)
+        self.date_combo.clear()
         if not dates:
             self.date_combo.addItem("No dates available")
             self.date_combo.setEnabled(False)
         else:
             self.date_combo.setEnabled(True)
             for d in dates:
-                date_str = d[0].strftime("%Y-%m-%d")
-                display_str = d[0].strftime("%d %b %Y")
+                date_str = d.strftime("%Y-%m-%d")
+                display_str = d.strftime("%d %b %Y")
                 self.date_combo.addItem(display_str, date_str)
-        cur.close()
-        conn.close()
+            self.date_combo.setCurrentIndex(0)
+        self.date_combo.blockSignals(False)
         self.on_date_changed()
 
     def on_date_changed(self):
+        self.runner.cancel("showtimes")
+        self.runner.cancel("seats")
+        self.time_combo.blockSignals(True)
         self.time_combo.clear()
+        self.time_combo.blockSignals(False)
+        self.showtimes_data = []
         self.hide_booking_interface()
 
-        idx = self.date_combo.currentIndex()
-        if idx < 0:
-            return
-
         selected_date_str = self.date_combo.currentData()
-        conn = get_db_connection()
-        if not conn:
+        if self.date_combo.currentIndex() < 0 or not selected_date_str:
+            self.set_placeholder("Select Date & Time\nto view available seats")
             return
-        cur = conn.cursor()
 
-        cur.execute(
-            """
-            SELECT id, hall_id, start_time, price 
-            FROM showtimes 
-            WHERE movie_id = %s AND start_time::date = %s
-            ORDER BY start_time
-        """,
-            (self.movie_id, selected_date_str),
+        self.time_combo.setEnabled(False)
+        self.set_placeholder("Loading showtimes...")
+        self.runner.submit(
+            "showtimes",
+            self.showtime_repo.get_showtimes,
+            self.movie_id,
+            selected_date_str,
+            on_result=self.on_showtimes_loaded,
+            on_error=self.on_load_failed,
         )
 
-        self.showtimes_data = cur.fetchall()
+    def on_showtimes_loaded(self, showtimes):
+        self.showtimes_data = showtimes
 
+        self.time_combo.blockSignals(True)
+        self.time_combo.clear()
         if not self.showtimes_data:
             self.time_combo.addItem("No showtimes")
             self.time_combo.setEnabled(False)
@@ -457,53 +504,52 @@ class ShowtimeView(QWidget):
                 time_obj = row[2]
                 time_display = time_obj.strftime("%H:%M")
                 self.time_combo.addItem(time_display)
-
             self.time_combo.setCurrentIndex(0)
-            self.load_seats()
+        self.time_combo.blockSignals(False)
 
-        cur.close()
-        conn.close()
+        if self.showtimes_data:
+            self.load_seats()
+        else:
+            self.set_placeholder("No showtimes\nfor the selected date")
 
     def load_seats(self):
+        self.runner.cancel("seats")
         if self.time_combo.currentIndex() < 0 or not self.showtimes_data:
             self.hide_booking_interface()
             return
 
-        self.show_booking_interface()
-
-        while self.grid.count():
-            child = self.grid.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        showtime_idx = self.time_combo.currentIndex()
+        if showtime_idx >= len(self.showtimes_data):
+            return
 
         self.selected_seats = []
         self.update_price()
+        self.set_placeholder("Loading seats...")
+
+        showtime_id, _, start_time, _ = self.showtimes_data[showtime_idx]
+        self.runner.submit(
+            "seats",
+            self.showtime_repo.get_seat_map,
+            showtime_id,
+            start_time,
+            on_result=self.build_seat_grid,
+            on_error=self.on_load_failed,
+        )
 
-        showtime_idx = self.time_combo.currentIndex()
-        if showtime_idx >= len(self.showtimes_data):
-            return
+    def on_load_failed(self, message):
+        self.set_placeholder("Could not reach the database.\nPlease try again.")
+        print(f"Error loading showtimes: {message}")
 
-        showtime_id = self.showtimes_data[showtime_idx][0]
+    def build_seat_grid(self, taken_seats):
+        self.show_booking_interface()
 
-        conn = get_db_connection()
-        taken_seats = []
-        if conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT bs.seat_number 
-                FROM booked_seats bs
-                JOIN bookings b ON bs.booking_id = b.id
-                WHERE b.showtime_id = %s
-            """,
-                (showtime_id,),
-            )
-            taken_seats = [r[0] for r in cur.fetchall()]
-            cur.close()
-            conn.close()
+        while self.grid.count():
+            child = self.grid.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
 
-        rows = 8
-        cols = 10
+        rows = SEAT_ROWS
+        cols = SEAT_COLS
 
         for r in range(rows):
             is_premium = r >= self.premium_rows_start_index
@@ -638,92 +684,122 @@ class ShowtimeView(QWidget):
         if not self.selected_seats:
             return
 
-        conn = get_db_connection()
-        if not conn:
-            return
-        cur = conn.cursor()
+        idx = self.time_combo.currentIndex()
+        showtime_id, _, start_time, base_price = self.showtimes_data[idx]
+        base_price = float(base_price)
+
+        total_price = 0.0
+        for seat in self.selected_seats:
+            row_idx = ord(seat[0]) - 65
+            if row_idx >= self.premium_rows_start_index:
+                total_price += base_price + self.premium_surcharge
+            else:
+                total_price += base_price
+
+        booking_info = {
+            "movie": self.movie_title,
+            "date": self.date_combo.currentText(),
+            "time": self.time_combo.currentText(),
+            "seats": list(self.selected_seats),
+            "total": total_price,
+            "poster_id": self.movie_id,
+        }
 
-        try:
-            idx = self.time_combo.currentIndex()
-            showtime_id = self.showtimes_data[idx][0]
-            base_price = float(self.showtimes_data[idx][3])
+        self.confirm_btn.setEnabled(False)
+        self.confirm_btn.setText("Booking...")
+        self.runner.submit(
+            "booking",
+            self.booking_repo.create_booking,
+            self.user_id,
+            showtime_id,
+            booking_info["seats"],
+            total_price,
+            start_time,
+            on_result=lambda result: self.on_booking_saved(result, booking_info),
+            on_error=self.on_booking_failed,
+        )
 
-            total_price = 0.0
-            for seat in self.selected_seats:
-                row_idx = ord(seat[0]) - 65
-                if row_idx >= self.premium_rows_start_index:
-                    total_price += base_price + self.premium_surcharge
-                else:
-                    total_price += base_price
+    def on_booking_saved(self, result, booking_info):
+        if result is None:
+            self.on_booking_failed("could not save the booking, please try again.")
+            return
 
-            cur.execute(
-                """
-                INSERT INTO bookings (user_id, showtime_id, total_price)
-                VALUES (%s, %s, %s) RETURNING id
-            """,
-                (self.user_id, showtime_id, total_price),
+        if result.lost_seats:
+            lost = ", ".join(result.lost_seats)
+            QMessageBox.warning(
+                self,
+                "Seats Taken",
+                f"Sorry, seat{'s' if len(result.lost_seats) > 1 else ''} {lost} "
+                "just got booked by someone else. Please pick again.",
             )
-            booking_id = cur.fetchone()[0]
-
-            for seat in self.selected_seats:
-                cur.execute(
-                    """
-                    INSERT INTO booked_seats (booking_id, seat_number)
-                    VALUES (%s, %s)
-                """,
-                    (booking_id, seat),
-                )
-
-            conn.commit()
-
-            booking_info = {
-                "movie": self.movie_title,
-                "date": self.date_combo.currentText(),
-                "time": self.time_combo.currentText(),
-                "seats": self.selected_seats,
-                "total": total_price,
-                "poster_id": self.movie_id,
-            }
+            self.load_seats()
+            return
 
-            from views.ticket_view import TicketView
+        from views.ticket_view import TicketView
 
-            self.ticket_window = TicketView(
-                self.user_id, self.username, self.role, booking_info
-            )
-            self.ticket_window.show()
-            self.close()
+        self.ticket_window = TicketView(
+            self.user_id, self.username, self.role, booking_info
+        )
+        self.ticket_window.show()
+        self.close()
 
-        except Exception as e:
-            conn.rollback()
-            QMessageBox.critical(self, "Error", f"Booking failed: {e}")
-        finally:
-            cur.close()
-            conn.close()
+    def on_booking_failed(self, message):
+        self.update_price()
+        QMessageBox.critical(self, "Error", f"Booking failed: {message}")
 
     def load_local_poster(self):
-        poster_path = f"posters_cache/movie_{self.movie_id}.jpg"
-        if os.path.exists(poster_path):
-            pix = QPixmap(poster_path)
-            if not pix.isNull():
-                return pix
+        """The rounded detail poster if it is decoded already, else None.
+
+        A poster that is on disk but not in memory starts decoding and
+        arrives through on_poster_decoded().
+        """
+        if not self.poster_url:
+            return None
+        key = poster_key(self.poster_url)
+        pix = self.poster_cache.pixmap(key, DETAIL)
+        if pix is not None:
+            return pix if not pix.isNull() else None
+        self.poster_decoding = self.poster_cache.load(key, DETAIL)
         return None
 
-    def make_rounded_pixmap(self, pixmap, radius=18):
-        if pixmap is None or pixmap.isNull():
-            return pixmap
-        target = QPixmap(pixmap.size())
-        target.fill(Qt.transparent)
-        painter = QPainter(target)
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        path = QPainterPath()
-        path.addRoundedRect(
-            QRectF(0, 0, pixmap.width(), pixmap.height()), radius, radius
-        )
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
-        return target
+    def load_poster(self):
+        # Opened without the grid row: look the link up first
+        if self.poster_url is None:
+            self.runner.submit(
+                "poster",
+                self.movie_repo.get_poster_link,
+                self.movie_id,
+                on_result=self.on_poster_link_loaded,
+            )
+        elif self.poster_url and not self.poster_decoding:
+            self.poster_loader.request(self.movie_id, self.poster_url)
+
+    def on_poster_link_loaded(self, url):
+        self.poster_url = url or ""
+        pix = self.load_local_poster()
+        if pix:
+            self.show_poster(pix)
+        elif self.poster_url and not self.poster_decoding:
+            self.poster_loader.request(self.movie_id, self.poster_url)
+
+    def on_poster_downloaded(self, movie_id, path):
+        # PosterStore files are named by their key
+        self.poster_cache.stored(os.path.basename(path))
+        pix = self.load_local_poster()
+        if pix:
+            self.show_poster(pix)
+
+    def on_poster_decoded(self, key, variant):
+        if variant != DETAIL or not self.poster_url or key != poster_key(self.poster_url):
+            return
+        self.poster_decoding = False
+        pix = self.poster_cache.pixmap(key, DETAIL)
+        if pix is not None and not pix.isNull():
+            self.show_poster(pix)
+
+    def show_poster(self, pix):
+        self.poster_lbl.setStyleSheet("background: transparent; border: none;")
+        self.poster_lbl.setPixmap(pix)
 
     def go_back_to_movies(self):
         from views.main_view import MainView